@@ -0,0 +1,265 @@
+"""
+Parallel form filling on virtual X displays
+PyAutoGUI drives one global mouse and keyboard per X display, so each worker
+process gets its own Xvfb display and browser. Records are sharded across the
+workers and every outcome is appended to a single JSON Lines journal.
+Linux only: requires the Xvfb binary (sudo apt install xvfb).
+"""
+
+import json
+import multiprocessing
+import os
+import queue
+import select
+import shutil
+import subprocess
+import tempfile
+import time
+
+from form_filler import DEFAULT_JOURNAL_FILE, FORM_FIELDS
+
+SCREEN_SIZE = (1920, 1080)
+
+# Chromium-based browsers can run several isolated instances side by side
+# when each one gets its own profile directory
+CHROMIUM_BROWSERS = ['chromium', 'chromium-browser', 'google-chrome', 'google-chrome-stable']
+
+
+class VirtualDisplay:
+    """An Xvfb server with a free display number picked by the X server itself"""
+
+    def __init__(self, size=SCREEN_SIZE, depth=24):
+        """
+        Args:
+            size (tuple): Screen width and height in pixels
+            depth (int): Colour depth in bits
+        """
+        self.size = size
+        self.depth = depth
+        self.process = None
+        self.name = None
+
+    def start(self, timeout=10):
+        """
+        Start Xvfb and wait until it accepts connections
+
+        Args:
+            timeout (float): Seconds to wait for the server to come up
+
+        Returns:
+            VirtualDisplay: self, with ``name`` set to e.g. ':99'
+        """
+        if shutil.which('Xvfb') is None:
+            raise RuntimeError("Xvfb not found - install it with: sudo apt install xvfb")
+
+        # -displayfd makes Xvfb choose a free display and report it once it is ready
+        read_fd, write_fd = os.pipe()
+        width, height = self.size
+        try:
+            self.process = subprocess.Popen(
+                ['Xvfb', '-displayfd', str(write_fd),
+                 '-screen', '0', f'{width}x{height}x{self.depth}', '-nolisten', 'tcp'],
+                pass_fds=(write_fd,),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        finally:
+            os.close(write_fd)
+
+        with os.fdopen(read_fd) as pipe:
+            ready, _, _ = select.select([pipe], [], [], timeout)
+            number = pipe.readline().strip() if ready else ''
+
+        if not number:
+            self.stop()
+            raise RuntimeError("Xvfb did not start")
+
+        self.name = f':{number}'
+        return self
+
+    def stop(self):
+        """Shut the X server down"""
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def isolated_browser_command(profile_dir, size=SCREEN_SIZE):
+    """
+    Build a webbrowser command line that starts a private browser instance
+
+    Args:
+        profile_dir (str): Profile directory used only by this worker
+        size (tuple): Window size, normally the display size
+
+    Returns:
+        str: Command line for webbrowser.get(), or None if no Chromium is installed
+    """
+    for name in CHROMIUM_BROWSERS:
+        executable = shutil.which(name)
+        if executable:
+            width, height = size
+            # Trailing '&' makes webbrowser launch it in the background
+            return (f'{executable} --user-data-dir={profile_dir} --no-first-run '
+                    f'--window-position=0,0 --window-size={width},{height} %s &')
+    return None
+
+
+def _fill_shard(display, records, url, pause, browser, results):
+    """
+    Worker process: fill a shard of records on one virtual display
+
+    Args:
+        display (str): X display name, e.g. ':99'
+        records (list): (row, record dict) pairs to process
+        url (str): URL of the form
+        pause (float): PyAutoGUI pause between actions
+        browser (str): webbrowser command line for this worker
+        results (Queue): Where journal entries are sent
+    """
+    # DISPLAY must be set before pyautogui (and Xlib) are imported
+    os.environ['DISPLAY'] = display
+
+    from form_filler import FormAutomation, pyautogui
+
+    pyautogui.PAUSE = pause
+    bot = FormAutomation(None, validate=False, browser=browser)
+
+    for row, record in records:
+        started = time.time()
+        entry = {'row': row, 'display': display, 'name': record.get(FORM_FIELDS[0]),
+                 'started': started}
+        try:
+            bot.fill_record(url, record)
+            entry.update(status='ok', error=None)
+        except pyautogui.FailSafeException:
+            entry.update(status='aborted', error='fail-safe triggered')
+            entry['finished'] = time.time()
+            results.put(entry)
+            break
+        except Exception as e:
+            entry.update(status='error', error=str(e))
+        entry['finished'] = time.time()
+        results.put(entry)
+
+
+def _shard(records, workers):
+    """Split (row, record) pairs round-robin into one list per worker"""
+    return [records[i::workers] for i in range(workers)]
+
+
+def run_parallel(excel_file, url, displays, max_records=None, pause=1.0,
+                 validate=True, rejects_file=None, browser=None,
+                 journal_file=DEFAULT_JOURNAL_FILE):
+    """
+    Fill forms from an Excel file using one worker per virtual display
+
+    Args:
+        excel_file (str): Path to Excel file containing form data
+        url (str): URL of the form
+        displays (int): Number of Xvfb displays / worker processes
+        max_records (int): Maximum number of records to process
+        pause (float): PyAutoGUI pause between actions
+        validate (bool): Normalize and validate records before filling
+        rejects_file (str): Where to write records that fail validation
+        browser (str): webbrowser command line shared by all workers;
+            None starts a private Chromium per display when one is installed
+        journal_file (str): JSON Lines file receiving one entry per record
+
+    Returns:
+        int: Process exit code
+    """
+    from form_filler import FormAutomation
+
+    loader = FormAutomation(excel_file, validate=validate, rejects_file=rejects_file)
+    if not loader.load_data():
+        return 1
+
+    data = loader.data if max_records is None else loader.data.head(max_records)
+    # Excel row number (one-based plus header) identifies each record in the journal
+    records = [(int(index) + 2, record) for index, record in zip(data.index, data.to_dict('records'))]
+    workers = max(1, min(displays, len(records)))
+
+    print(f"\n🤖 Filling {len(records)} records on {workers} virtual displays...")
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    pool = []
+    processes = []
+    profile_root = tempfile.mkdtemp(prefix='rpa-profiles-')
+    counts = {}
+
+    try:
+        for number, shard in enumerate(_shard(records, workers)):
+            display = VirtualDisplay().start()
+            pool.append(display)
+
+            worker_browser = browser
+            if worker_browser is None:
+                worker_browser = isolated_browser_command(os.path.join(profile_root, str(number)))
+            if worker_browser is None:
+                print("  ⚠ No Chromium found, using the default browser on every display")
+
+            process = context.Process(
+                target=_fill_shard,
+                args=(display.name, shard, url, pause, worker_browser, results),
+                name=f'form-filler{display.name}',
+            )
+            process.start()
+            processes.append((process, shard))
+            print(f"  → Worker {number + 1} on display {display.name}: {len(shard)} records")
+
+        reported = set()
+        with open(journal_file, 'a', encoding='utf-8') as journal:
+            while True:
+                try:
+                    entry = results.get(timeout=0.5)
+                except queue.Empty:
+                    if not any(process.is_alive() for process, _ in processes):
+                        break
+                    continue
+
+                reported.add(entry['row'])
+                counts[entry['status']] = counts.get(entry['status'], 0) + 1
+                journal.write(json.dumps(entry) + '\n')
+                journal.flush()
+                print(f"  {'✓' if entry['status'] == 'ok' else '✗'} Row {entry['row']} "
+                      f"on {entry['display']}: {entry['status']}")
+
+            # Records a crashed or aborted worker never reached
+            for process, shard in processes:
+                process.join()
+                for row, record in shard:
+                    if row not in reported:
+                        counts['not_run'] = counts.get('not_run', 0) + 1
+                        journal.write(json.dumps({
+                            'row': row, 'display': None, 'name': record.get(FORM_FIELDS[0]),
+                            'status': 'not_run', 'error': f'worker exit code {process.exitcode}',
+                        }) + '\n')
+
+    except RuntimeError as e:
+        print(f"✗ Could not start virtual display: {e}")
+        return 1
+
+    finally:
+        for process, _ in processes:
+            if process.is_alive():
+                process.terminate()
+        for display in pool:
+            display.stop()
+        shutil.rmtree(profile_root, ignore_errors=True)
+
+    summary = ', '.join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"\n🎉 Parallel run completed: {summary or 'nothing to do'}")
+    print(f"  → Journal: {journal_file}")
+    return 0 if counts.get('ok', 0) == len(records) else 1
@@ -0,0 +1,142 @@
+"""
+Async form-filling engine for FormAutomation
+A producer loads, validates and compiles records into UI actions ahead of
+time, a single executor thread performs the actions, and a consumer writes
+the outcomes. Bounded queues connect the three stages, so the UI is the only
+critical path while data preparation and result I/O overlap with it.
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import time
+
+from form_filler import (DEFAULT_JOURNAL_FILE, DEFAULT_REJECTS_FILE, FORM_FIELDS, ActionExecutor,
+                         FormAutomation, compile_record, pyautogui)
+
+
+class FormFillEngine:
+    """Producer -> UI executor -> consumer pipeline over bounded queues"""
+
+    def __init__(self, excel_file, url, max_records=None, validate=True,
+                 rejects_file=DEFAULT_REJECTS_FILE, browser=None,
+                 journal_file=DEFAULT_JOURNAL_FILE, queue_size=8, interval=0.1):
+        """
+        Args:
+            excel_file (str): Path to Excel file containing form data
+            url (str): URL of the form
+            max_records (int): Maximum number of records to process (None for all)
+            validate (bool): Normalize and validate records before filling
+            rejects_file (str): Where to write records that fail validation
+            browser (str): webbrowser name or command line (None for the default)
+            journal_file (str): JSON Lines file receiving one entry per record
+            queue_size (int): Records compiled ahead of the UI / outcomes buffered
+            interval (float): Delay between keystrokes
+        """
+        self.bot = FormAutomation(excel_file, validate=validate, rejects_file=rejects_file,
+                                  browser=browser)
+        self.url = url
+        self.max_records = max_records
+        self.journal_file = journal_file
+        self.queue_size = queue_size
+        self.interval = interval
+        self.counts = {}
+        self.loaded = False
+        self.stopped = False
+
+    async def _produce(self, jobs):
+        """Load, validate and compile records, staying ahead of the UI"""
+        try:
+            # pandas work runs in a worker thread so the countdown keeps ticking
+            self.loaded = await asyncio.to_thread(self.bot.load_data)
+            if not self.loaded:
+                return
+
+            data = self.bot.data if self.max_records is None else self.bot.data.head(self.max_records)
+            for index, record in zip(data.index, data.to_dict('records')):
+                if self.stopped:
+                    break
+                actions = compile_record(self.url, record, self.interval)
+                # Excel row number (one-based plus header), as in the reject file
+                await jobs.put((int(index) + 2, record.get(FORM_FIELDS[0]), actions))
+        finally:
+            await jobs.put(None)
+
+    async def _execute(self, jobs, outcomes, ui_thread):
+        """Run compiled jobs one at a time on the UI thread"""
+        loop = asyncio.get_running_loop()
+        # Outcomes are reported by the consumer, not by the actions themselves
+        executor = ActionExecutor(self.bot, verbose=False)
+
+        while (job := await jobs.get()) is not None:
+            row, name, actions = job
+            entry = {'row': row, 'name': name, 'started': time.time()}
+
+            if self.stopped:
+                entry.update(status='not_run', error='run aborted')
+            else:
+                try:
+                    await loop.run_in_executor(ui_thread, executor.run, actions)
+                    entry.update(status='ok', error=None)
+                except pyautogui.FailSafeException:
+                    self.stopped = True
+                    entry.update(status='aborted', error='fail-safe triggered')
+                except Exception as e:
+                    entry.update(status='error', error=str(e))
+
+            entry['finished'] = time.time()
+            await outcomes.put(entry)
+
+        await outcomes.put(None)
+
+    async def _consume(self, outcomes):
+        """Write outcomes to the journal as they arrive"""
+        with open(self.journal_file, 'a', encoding='utf-8') as journal:
+            while (entry := await outcomes.get()) is not None:
+                self.counts[entry['status']] = self.counts.get(entry['status'], 0) + 1
+                journal.write(json.dumps(entry) + '\n')
+                journal.flush()
+
+                if entry['status'] == 'ok':
+                    print(f"✓ Row {entry['row']} submitted: {entry['name']}")
+                elif entry['status'] == 'aborted':
+                    print("\n⚠️  EMERGENCY STOP - Mouse moved to corner!")
+                else:
+                    print(f"✗ Row {entry['row']} {entry['status']}: {entry['error']}")
+
+    async def _countdown(self, seconds):
+        """Countdown before starting; data loading carries on in the background"""
+        print("⚠️  IMPORTANT: Move mouse to top-left corner to emergency stop!")
+        for i in range(seconds, 0, -1):
+            print(f"   Starting in {i}...")
+            await asyncio.sleep(1)
+
+    async def run(self, countdown=3):
+        """
+        Fill the form for every record
+
+        Args:
+            countdown (int): Seconds to wait before taking over the mouse
+
+        Returns:
+            int: Process exit code
+        """
+        print("\n🤖 Starting async automation...")
+
+        jobs = asyncio.Queue(maxsize=self.queue_size)
+        outcomes = asyncio.Queue(maxsize=self.queue_size)
+        producer = asyncio.create_task(self._produce(jobs))
+        consumer = asyncio.create_task(self._consume(outcomes))
+
+        # A single thread keeps mouse and keyboard actions strictly sequential
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='ui') as ui_thread:
+            await self._countdown(countdown)
+            await asyncio.gather(producer, self._execute(jobs, outcomes, ui_thread), consumer)
+
+        if not self.loaded:
+            return 1
+
+        summary = ', '.join(f"{count} {status}" for status, count in sorted(self.counts.items()))
+        print(f"\n🎉 Automation completed: {summary or 'nothing to do'}")
+        print(f"  → Journal: {self.journal_file}")
+        return 0 if set(self.counts) <= {'ok'} else 1
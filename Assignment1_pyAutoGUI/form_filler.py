@@ -3,34 +3,185 @@ RPA Web Form Automation using PyAutoGUI
 This script automates filling out a contact form by reading data from Excel
 """
 
-import pyautogui
-import time
-import pandas as pd
-import webbrowser
+import argparse
+import importlib
+import json
 import os
+import pathlib
+import sys
+import time
+
+
+class _LazyModule:
+    """
+    Stand-in for a heavy module that is only imported on first use
+
+    pyautogui (and the Pillow/screen backends it pulls in) is slow to import,
+    so quick commands such as ``--help`` never pay for it.
+    """
+
+    def __init__(self, name, setup=None):
+        self._name = name
+        self._setup = setup
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            module = importlib.import_module(self._name)
+            if self._setup:
+                self._setup(module)
+            self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        # Settings such as pyautogui.PAUSE must reach the real module
+        if attr.startswith('_'):
+            object.__setattr__(self, attr, value)
+        else:
+            setattr(self._load(), attr, value)
+
+
+def _configure_pyautogui(module):
+    """Apply PyAutoGUI safety settings the first time the module is loaded"""
+    # Run as a script, this file is imported a second time as form_filler by
+    # the helper modules; that copy must not reset a PAUSE set from the CLI
+    if getattr(module, '_form_filler_configured', False):
+        return
+    module._form_filler_configured = True
+    module.PAUSE = 1  # Add 1 second pause between actions
+    module.FAILSAFE = True  # Move mouse to top-left corner to abort
+
+
+pyautogui = _LazyModule('pyautogui', setup=_configure_pyautogui)
+
+DEFAULT_EXCEL_FILE = "sample_data.xlsx"
+DEFAULT_FORM_FILE = "test_form.html"
+DEFAULT_REJECTS_FILE = "rejected_records.csv"
+DEFAULT_JOURNAL_FILE = "form_fill_journal.jsonl"
+
+# Fields of the form in TAB order
+FORM_FIELDS = ['Name', 'Email', 'Phone', 'Message']
+
+
+def compile_fields(record, interval=0.1):
+    """
+    UI actions that fill the form fields using TAB navigation
+    
+    Args:
+        record (dict): Form data keyed by field name
+        interval (float): Delay between keystrokes
+    
+    Returns:
+        list: (operation, *arguments) tuples for ActionExecutor
+    """
+    actions = [('log', f"\n🔄 Processing: {record[FORM_FIELDS[0]]}"),
+               ('press', 'tab'), ('sleep', 0.3)]  # TAB into the first field
+    for number, field in enumerate(FORM_FIELDS):
+        if number:
+            actions.append(('press', 'tab'))
+        actions += [('log', f"  → Filling {field}..."),
+                    ('write', str(record[field]), interval),
+                    ('sleep', 0.5)]
+    actions.append(('sleep', 0.5))
+    return actions
+
+
+def compile_submit():
+    """UI actions that TAB to the submit button and press it"""
+    return [('log', "  → Submitting form..."),
+            ('press', 'tab'), ('sleep', 0.3), ('press', 'enter'),
+            ('sleep', 2),  # Wait for submission
+            ('log', "✓ Form submitted!")]
+
+
+def compile_record(url, record, interval=0.1):
+    """
+    Turn one record into the list of UI actions that fills and submits the form
+    
+    Args:
+        url (str): URL of the form
+        record (dict): Form data keyed by field name
+        interval (float): Delay between keystrokes
+    
+    Returns:
+        list: (operation, *arguments) tuples, consecutive waits merged
+    """
+    compiled = []
+    for action in [('open', url)] + compile_fields(record, interval) + compile_submit():
+        if action[0] == 'sleep' and compiled and compiled[-1][0] == 'sleep':
+            compiled[-1] = ('sleep', compiled[-1][1] + action[1])
+        else:
+            compiled.append(action)
+    return compiled
+
+
+class ActionExecutor:
+    """Performs compiled UI actions; only ever used from one thread at a time"""
+    
+    def __init__(self, bot, verbose=True):
+        """
+        Args:
+            bot (FormAutomation): Provides open_form_page() and browser settings
+            verbose (bool): Print the progress messages included in the actions
+        """
+        self.bot = bot
+        self.operations = {
+            'open': bot.open_form_page,
+            'press': lambda key: pyautogui.press(key),
+            'write': lambda text, interval: pyautogui.write(text, interval=interval),
+            'sleep': time.sleep,
+            'log': print if verbose else lambda message: None,
+        }
+    
+    def run(self, actions):
+        """Perform a list of compiled actions in order"""
+        for operation, *arguments in actions:
+            self.operations[operation](*arguments)
 
-# Set PyAutoGUI safety settings
-pyautogui.PAUSE = 1  # Add 1 second pause between actions
-pyautogui.FAILSAFE = True  # Move mouse to top-left corner to abort
 
 class FormAutomation:
     """Class to handle automated form filling"""
     
-    def __init__(self, excel_file):
+    def __init__(self, excel_file, validate=True, rejects_file=DEFAULT_REJECTS_FILE,
+                 browser=None):
         """
         Initialize the automation with data source
         
         Args:
             excel_file (str): Path to Excel file containing form data
+            validate (bool): Normalize and validate records before typing them
+            rejects_file (str): Where to write records that fail validation
+            browser (str): webbrowser name or command line ("... %s &"),
+                None for the system default browser
         """
         self.excel_file = excel_file
+        self.validate = validate
+        self.rejects_file = rejects_file
+        self.browser = browser
         self.data = None
+        self._capture = None
+    
+    @property
+    def capture(self):
+        """Frame capture service, created on first image search"""
+        if self._capture is None:
+            from screen_capture import FrameCapture
+            self._capture = FrameCapture()
+        return self._capture
         
     def load_data(self):
-        """Load data from Excel file"""
+        """Load data from Excel file, dropping records that fail validation"""
+        import pandas as pd  # Imported here so non-form commands start fast
+
         try:
             self.data = pd.read_excel(self.excel_file)
             print(f"✓ Loaded {len(self.data)} records from {self.excel_file}")
+            if self.validate:
+                from record_validation import prepare_records
+                self.data = prepare_records(self.data, self.rejects_file)
             return True
         except Exception as e:
             print(f"✗ Error loading Excel file: {e}")
@@ -38,20 +189,22 @@ class FormAutomation:
     
     def open_form_page(self, url):
         """
-        Open the form page in default browser
+        Open the form page in the configured (or default) browser
         
         Args:
             url (str): URL of the form to fill
         """
+        import webbrowser
+        
         print(f"\n📋 Opening form page: {url}")
-        webbrowser.open(url)
+        webbrowser.get(self.browser).open(url)
         time.sleep(3)  # Wait for browser to open and page to load
         
         # Maximize browser window for consistent positioning
         pyautogui.hotkey('win', 'up')
         time.sleep(1)
     
-    def find_and_click(self, image_path, description, confidence=0.8):
+    def find_and_click(self, image_path, description, confidence=0.8, region=None):
         """
         Find an element by image and click it
         
@@ -59,12 +212,14 @@ class FormAutomation:
             image_path (str): Path to screenshot of element
             description (str): Description for logging
             confidence (float): Matching confidence (0-1)
+            region (tuple): (left, top, width, height) to search, None for whole screen
         
         Returns:
             bool: True if found and clicked, False otherwise
         """
         try:
-            location = pyautogui.locateOnScreen(image_path, confidence=confidence)
+            # Searches against an unchanged region are answered from cache
+            location = self.capture.locate(image_path, region=region, confidence=confidence)
             if location:
                 center = pyautogui.center(location)
                 pyautogui.click(center)
@@ -77,73 +232,65 @@ class FormAutomation:
             print(f"✗ Error finding {description}: {e}")
             return False
     
-    def type_with_delay(self, text, interval=0.1):
+    def wait_for_element(self, image_path, description, timeout=10, confidence=0.8, region=None):
         """
-        Type text with delay between keystrokes
+        Wait for an element to appear on screen
         
         Args:
-            text (str): Text to type
-            interval (float): Delay between keystrokes
+            image_path (str): Path to screenshot of element
+            description (str): Description for logging
+            timeout (float): Seconds to wait
+            confidence (float): Matching confidence (0-1)
+            region (tuple): (left, top, width, height) to watch, None for whole screen
+        
+        Returns:
+            Box: Location of the element, or None on timeout
         """
-        pyautogui.write(str(text), interval=interval)
-        time.sleep(0.5)
+        location = self.capture.wait_for_image(image_path, region=region,
+                                               confidence=confidence, timeout=timeout)
+        if location:
+            print(f"✓ Found: {description}")
+        else:
+            print(f"✗ Timed out waiting for: {description}")
+        return location
     
     def fill_form_fields(self, record):
         """
         Fill form fields using TAB navigation
         
         Args:
-            record (Series): Pandas series containing form data
+            record (Series): Pandas series (or dict) containing form data
         """
-        print(f"\n🔄 Processing: {record['Name']}")
-        
-        # Click in first field or press TAB to start
-        pyautogui.press('tab')
-        time.sleep(0.3)
-        
-        # Fill Name field
-        print("  → Filling Name...")
-        self.type_with_delay(record['Name'])
-        pyautogui.press('tab')
-        
-        # Fill Email field
-        print("  → Filling Email...")
-        self.type_with_delay(record['Email'])
-        pyautogui.press('tab')
-        
-        # Fill Phone field
-        print("  → Filling Phone...")
-        self.type_with_delay(record['Phone'])
-        pyautogui.press('tab')
-        
-        # Fill Message field
-        print("  → Filling Message...")
-        self.type_with_delay(record['Message'])
-        
-        time.sleep(0.5)
+        ActionExecutor(self).run(compile_fields(record))
     
     def submit_form(self):
-        """Submit the form using keyboard shortcut or button click"""
-        print("  → Submitting form...")
-        
-        # Method 1: Press TAB to reach submit button and ENTER
-        pyautogui.press('tab')
-        time.sleep(0.3)
-        pyautogui.press('enter')
+        """Submit the form by tabbing to the submit button and pressing ENTER"""
+        ActionExecutor(self).run(compile_submit())
+    
+    def fill_record(self, url, record):
+        """
+        Open the form, fill it with one record and submit it
         
-        time.sleep(2)  # Wait for submission
-        print("✓ Form submitted!")
+        Args:
+            url (str): URL of the form
+            record (Series): Pandas series (or dict) containing form data
+        """
+        ActionExecutor(self).run(compile_record(url, record))
     
-    def automated_fill(self, url, max_records=None):
+    def automated_fill(self, url, max_records=None, countdown=3):
         """
         Main automation workflow
         
         Args:
             url (str): URL of the form
             max_records (int): Maximum number of records to process
+            countdown (int): Seconds to wait before taking over the mouse
+        
+        Returns:
+            int: Number of records submitted, or None if loading failed
         """
         if not self.load_data():
-            return
+            return None
         
         # Limit records if specified
         records_to_process = self.data if max_records is None else self.data.head(max_records)
@@ -152,21 +299,20 @@ class FormAutomation:
         print("⚠️  IMPORTANT: Move mouse to top-left corner to emergency stop!")
         
         # Countdown before starting
-        for i in range(3, 0, -1):
+        for i in range(countdown, 0, -1):
             print(f"   Starting in {i}...")
             time.sleep(1)
+
+        completed = 0
         
         # Process each record
-        for index, record in records_to_process.iterrows():
+        for number, (_, record) in enumerate(records_to_process.iterrows(), 1):
             try:
-                # Open form page for each submission
-                self.open_form_page(url)
-                
-                # Fill and submit
-                self.fill_form_fields(record)
-                self.submit_form()
+                # Open form page, fill and submit
+                self.fill_record(url, record)
                 
-                print(f"✓ Completed record {index + 1}/{len(records_to_process)}")
+                completed += 1
+                print(f"✓ Completed record {number}/{len(records_to_process)}")
                 
                 # Wait before next iteration
                 time.sleep(2)
@@ -175,15 +321,23 @@ class FormAutomation:
                 print("\n⚠️  EMERGENCY STOP - Mouse moved to corner!")
                 break
             except Exception as e:
-                print(f"\n✗ Error processing record {index + 1}: {e}")
+                print(f"\n✗ Error processing record {number}: {e}")
                 continue
         
         print("\n🎉 Automation completed!")
+        return completed
 
 def get_screen_info():
     """Display screen information for positioning"""
-    screen_width, screen_height = pyautogui.size()
-    current_x, current_y = pyautogui.position()
+    from screen_metrics import screen_metrics
+    
+    # Native calls keep this command fast; pyautogui only where they aren't available
+    metrics = screen_metrics()
+    if metrics:
+        (screen_width, screen_height), (current_x, current_y) = metrics
+    else:
+        screen_width, screen_height = pyautogui.size()
+        current_x, current_y = pyautogui.position()
     
     print("="*50)
     print("SCREEN INFORMATION")
@@ -233,7 +387,138 @@ def demo_mouse_keyboard():
     
     print("\n✓ Demo completed!")
 
-if __name__ == "__main__":
+def track_mouse_position():
+    """Print the live mouse position until Ctrl+C is pressed"""
+    print("\n📍 Mouse Position Tracker (Press Ctrl+C to stop)")
+    print("Move your mouse around to see coordinates:\n")
+    try:
+        while True:
+            x, y = pyautogui.position()
+            print(f"\rX: {x:4d}  Y: {y:4d}", end='', flush=True)
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        print("\n\nTracker stopped.")
+
+def default_form_url():
+    """Return the file:// URL of the bundled test form"""
+    return pathlib.Path(DEFAULT_FORM_FILE).resolve().as_uri()
+
+def run_form_fill(excel_file, url=None, max_records=1, countdown=3, pause=1.0,
+                  validate=True, rejects_file=DEFAULT_REJECTS_FILE,
+                  displays=0, browser=None, journal_file=DEFAULT_JOURNAL_FILE,
+                  engine='sequential'):
+    """
+    Run form automation without any prompts
+    
+    Args:
+        excel_file (str): Path to Excel file containing form data
+        url (str): URL of the form (defaults to the bundled test form)
+        max_records (int): Maximum number of records to process (None for all)
+        countdown (int): Seconds to wait before taking over the mouse
+        pause (float): PyAutoGUI pause between actions
+        validate (bool): Normalize and validate records before typing them
+        rejects_file (str): Where to write records that fail validation
+        displays (int): Run this many workers on virtual displays (0 for the real screen)
+        browser (str): webbrowser name or command line (None for the default)
+        journal_file (str): JSON Lines file for per-record outcomes
+            (parallel and async runs)
+        engine (str): 'sequential' or 'async' (pipelined producer/executor/consumer)
+    
+    Returns:
+        int: Process exit code
+    """
+    if not os.path.exists(excel_file):
+        print(f"\n✗ Error: {excel_file} not found!")
+        print("  Please ensure the Excel file is in the same directory.")
+        return 1
+    
+    if not url:
+        url = default_form_url()
+        print(f"Using test form: {url}")
+    
+    if displays:
+        from display_pool import run_parallel
+        return run_parallel(
+            excel_file, url, displays,
+            max_records=max_records,
+            pause=pause,
+            validate=validate,
+            rejects_file=rejects_file,
+            browser=browser,
+            journal_file=journal_file,
+        )
+    
+    pyautogui.PAUSE = pause
+    
+    if engine == 'async':
+        import asyncio
+        from form_engine import FormFillEngine
+        
+        form_engine = FormFillEngine(
+            excel_file, url,
+            max_records=max_records,
+            validate=validate,
+            rejects_file=rejects_file,
+            browser=browser,
+            journal_file=journal_file,
+        )
+        return asyncio.run(form_engine.run(countdown=countdown))
+    
+    bot = FormAutomation(excel_file, validate=validate, rejects_file=rejects_file,
+                         browser=browser)
+    completed = bot.automated_fill(url, max_records=max_records, countdown=countdown)
+    return 0 if completed is not None else 1
+
+def run_macro_command(args):
+    """
+    Record, compile or replay a keyboard and mouse macro
+    
+    Args:
+        args (Namespace): Parsed record / compile / replay arguments
+    
+    Returns:
+        int: Process exit code
+    """
+    import macro
+    
+    try:
+        if args.command == 'record':
+            print(f"🔴 Recording... press {args.stop_key} to stop")
+            events = macro.MacroRecorder(stop_key=args.stop_key).record()
+            steps = macro.compile_macro(events, args.idle_gap)
+            macro.save_macro(args.output, events=events, steps=steps)
+            print(f"✓ Recorded {len(events)} events, compiled to {len(steps)} steps: {args.output}")
+        
+        elif args.command == 'compile':
+            with open(args.input, encoding='utf-8') as f:
+                events = json.load(f).get('events', [])
+            steps = macro.compile_macro(events, args.idle_gap)
+            macro.save_macro(args.output, events=events, steps=steps)
+            print(f"✓ Compiled {len(events)} events to {len(steps)} steps: {args.output}")
+        
+        else:
+            steps = macro.load_macro(args.macro)
+            print(f"▶ Replaying {len(steps)} steps from {args.macro}")
+            print("⚠️  IMPORTANT: Move mouse to top-left corner to emergency stop!")
+            for i in range(args.countdown, 0, -1):
+                print(f"   Starting in {i}...")
+                time.sleep(1)
+            started = time.monotonic()
+            macro.MacroPlayer(step_pause=args.step_pause, grace=args.grace).run(steps)
+            print(f"✓ Replay finished in {time.monotonic() - started:.1f}s")
+    
+    # Checked first so file errors don't import pyautogui just to match the next clause
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"✗ Macro error: {e}")
+        return 1
+    except pyautogui.FailSafeException:
+        print("\n⚠️  EMERGENCY STOP - Mouse moved to corner!")
+        return 1
+    
+    return 0
+
+def interactive_menu():
+    """Original menu-driven entry point, used when no command is given"""
     print("""
     ╔════════════════════════════════════════════════════╗
     ║     PyAutoGUI RPA - Form Automation Demo           ║
@@ -255,38 +540,184 @@ if __name__ == "__main__":
         demo_mouse_keyboard()
         
     elif choice == "2":
-        # Check if Excel file exists
-        excel_file = "sample_data.xlsx"
-        if not os.path.exists(excel_file):
-            print(f"\n✗ Error: {excel_file} not found!")
-            print("  Please ensure the Excel file is in the same directory.")
-        else:
-            # Example form URL - Replace with your actual form URL
-            form_url = input("\nEnter form URL (or press Enter for demo URL): ").strip()
-            if not form_url:
-                form_url = "https://docs.google.com/forms/d/e/YOUR_FORM_ID/viewform"
-                print(f"Using demo URL: {form_url}")
-            
-            # Create automation instance
-            bot = FormAutomation(excel_file)
-            
-            # Run automation (process only first record for demo)
-            max_records = int(input("How many records to process? (default 1): ") or "1")
-            bot.automated_fill(form_url, max_records=max_records)
+        # Example form URL - Replace with your actual form URL
+        form_url = input("\nEnter form URL (or press Enter for the test form): ").strip()
+        
+        # Run automation (process only first record for demo)
+        max_records = int(input("How many records to process? (default 1): ") or "1")
+        return run_form_fill(DEFAULT_EXCEL_FILE, form_url, max_records=max_records)
     
     elif choice == "3":
         get_screen_info()
-        
-        # Display mouse position tracking
-        print("\n📍 Mouse Position Tracker (Press Ctrl+C to stop)")
-        print("Move your mouse around to see coordinates:\n")
-        try:
-            while True:
-                x, y = pyautogui.position()
-                print(f"\rX: {x:4d}  Y: {y:4d}", end='', flush=True)
-                time.sleep(0.1)
-        except KeyboardInterrupt:
-            print("\n\nTracker stopped.")
+        track_mouse_position()
     
     else:
         print("\n✗ Invalid choice!")
+        return 1
+    
+    return 0
+
+def load_config(path):
+    """
+    Load option defaults from a JSON config file
+    
+    Keys use the option names with dashes replaced by underscores,
+    e.g. {"excel": "data.xlsx", "max_records": 10}.
+    
+    Args:
+        path (str): Path to JSON config file
+    
+    Returns:
+        dict: Option defaults
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError(f"{path}: config must be a JSON object")
+    return config
+
+def build_parser():
+    """Build the command-line parser"""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--config', help='JSON file with default option values')
+    
+    parser = argparse.ArgumentParser(
+        description='PyAutoGUI RPA - Form Automation Demo',
+        epilog='Run without a command for the interactive menu.',
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    
+    fill = subparsers.add_parser('form-fill', parents=[common],
+                                 help='Fill the form once per Excel record')
+    fill.add_argument('--excel', default=DEFAULT_EXCEL_FILE,
+                      help='Excel file with Name, Email, Phone, Message columns')
+    fill.add_argument('--url', help='Form URL (default: bundled test_form.html)')
+    fill.add_argument('--max-records', type=int, default=1,
+                      help='Records to process, 0 for all (default: 1)')
+    fill.add_argument('--countdown', type=int, default=3,
+                      help='Seconds to wait before starting (default: 3)')
+    fill.add_argument('--pause', type=float, default=1.0,
+                      help='Pause between PyAutoGUI actions (default: 1.0)')
+    fill.add_argument('--validate', action=argparse.BooleanOptionalAction, default=True,
+                      help='Check and normalize records before filling (default: on)')
+    fill.add_argument('--rejects', default=DEFAULT_REJECTS_FILE,
+                      help=f'CSV or .xlsx file for rejected records (default: {DEFAULT_REJECTS_FILE})')
+    fill.add_argument('--displays', type=int, default=0,
+                      help='Fill forms in parallel on this many Xvfb displays (Linux only)')
+    fill.add_argument('--browser',
+                      help='Browser name or command line with %%s for the URL')
+    fill.add_argument('--journal', default=DEFAULT_JOURNAL_FILE,
+                      help='JSON Lines file for per-record results of --displays and '
+                           f'--engine async runs (default: {DEFAULT_JOURNAL_FILE})')
+    fill.add_argument('--engine', choices=['sequential', 'async'], default='sequential',
+                      help='async overlaps data preparation and result writing '
+                           'with UI work (default: sequential)')
+    
+    info = subparsers.add_parser('screen-info', parents=[common],
+                                 help='Print screen size and mouse position')
+    info.add_argument('--track', action='store_true',
+                      help='Keep printing the mouse position until Ctrl+C')
+    
+    subparsers.add_parser('demo', parents=[common],
+                          help='Run the basic mouse and keyboard demo')
+    
+    record = subparsers.add_parser('record', parents=[common],
+                                   help='Record keyboard and mouse input into a macro file')
+    record.add_argument('output', help='Macro file to write (JSON)')
+    record.add_argument('--stop-key', default='esc',
+                        help='Key that ends the recording (default: esc)')
+    record.add_argument('--idle-gap', type=float, default=0.4,
+                        help='Pauses longer than this become readiness checks (default: 0.4)')
+    
+    compile_cmd = subparsers.add_parser('compile', parents=[common],
+                                        help='Recompile a recorded macro')
+    compile_cmd.add_argument('input', help='Macro file with a recording')
+    compile_cmd.add_argument('output', help='Macro file to write')
+    compile_cmd.add_argument('--idle-gap', type=float, default=0.4,
+                             help='Pauses longer than this become readiness checks (default: 0.4)')
+    
+    replay = subparsers.add_parser('replay', parents=[common],
+                                   help='Replay a macro file at full speed')
+    replay.add_argument('macro', help='Macro file to replay')
+    replay.add_argument('--countdown', type=int, default=3,
+                        help='Seconds to wait before starting (default: 3)')
+    replay.add_argument('--step-pause', type=float, default=0.02,
+                        help='Pause after each action (default: 0.02)')
+    replay.add_argument('--grace', type=float,
+                        help='Stop waiting for the screen to react after this many seconds '
+                             '(default: up to the recorded pause)')
+    
+    return parser, subparsers
+
+def parse_args(argv=None):
+    """
+    Parse command-line arguments, using --config values as defaults
+    
+    Args:
+        argv (list): Arguments to parse (defaults to sys.argv[1:])
+    
+    Returns:
+        Namespace: Parsed arguments
+    """
+    pre = argparse.ArgumentParser(add_help=False)
+    pre.add_argument('--config')
+    known, _ = pre.parse_known_args(argv)
+    
+    parser, subparsers = build_parser()
+    if known.config:
+        try:
+            config = load_config(known.config)
+        except (OSError, ValueError) as e:
+            parser.error(f"could not read config: {e}")
+        for subparser in subparsers.choices.values():
+            subparser.set_defaults(**config)
+    
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    Command-line entry point
+    
+    Args:
+        argv (list): Arguments to parse (defaults to sys.argv[1:])
+    
+    Returns:
+        int: Process exit code
+    """
+    args = parse_args(argv)
+    
+    if args.command is None:
+        return interactive_menu()
+    
+    if args.command == 'form-fill':
+        return run_form_fill(
+            args.excel,
+            url=args.url,
+            max_records=args.max_records or None,
+            countdown=args.countdown,
+            pause=args.pause,
+            validate=args.validate,
+            rejects_file=args.rejects,
+            displays=args.displays,
+            browser=args.browser,
+            journal_file=args.journal,
+            engine=args.engine,
+        )
+    
+    if args.command == 'screen-info':
+        get_screen_info()
+        if args.track:
+            track_mouse_position()
+        return 0
+    
+    if args.command == 'demo':
+        demo_mouse_keyboard()
+        return 0
+    
+    if args.command in ('record', 'compile', 'replay'):
+        return run_macro_command(args)
+    
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
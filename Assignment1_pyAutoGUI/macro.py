@@ -0,0 +1,363 @@
+"""
+Keyboard and mouse macros: record, compile and replay
+A recording captures a real session with human timing. Compiling it merges
+typed characters into bulk writes, drops mouse moves that a click makes
+redundant, and turns recorded pauses into readiness checks that wait for the
+screen to settle. The player then runs the result as fast as is safe.
+Recording needs the optional pynput package (pip install pynput).
+"""
+
+import json
+import sys
+import threading
+import time
+
+from form_filler import pyautogui
+
+MACRO_VERSION = 1
+
+# Recorded pauses longer than this become readiness checks, shorter ones are dropped
+IDLE_GAP = 0.4
+
+# Two clicks at the same spot within this many seconds form a double click
+DOUBLE_CLICK_TIME = 0.3
+
+# pynput key names that differ from pyautogui's once _l/_r suffixes are removed
+KEY_NAMES = {'cmd': 'win', 'alt_gr': 'altright'}
+MODIFIERS = {'ctrl', 'alt', 'shift', 'win', 'altright'}
+
+# Macros store scrolling in wheel notches (as pynput reports it). pyautogui
+# passes the amount to Windows as a raw wheel delta, which is 120 per notch
+WHEEL_DELTA = 120 if sys.platform == 'win32' else 1
+
+
+def _key_name(key):
+    """
+    Translate a pynput key into a pyautogui key name
+
+    Returns:
+        tuple: (name, is_character)
+    """
+    char = getattr(key, 'char', None)
+    if char is not None:
+        # With Ctrl held some platforms report control codes (Ctrl+S -> '\x13')
+        if len(char) == 1 and ord(char) < 32:
+            char = chr(ord(char) + 96)
+        return char, True
+
+    name = getattr(key, 'name', None)
+    if name is None:
+        return None, False
+    if name == 'space':
+        return ' ', True
+    for suffix in ('_l', '_r'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return KEY_NAMES.get(name, name.replace('_', '')), False
+
+
+class MacroRecorder:
+    """Records keyboard and mouse input until the stop key is pressed"""
+
+    def __init__(self, stop_key='esc', move_interval=0.05):
+        """
+        Args:
+            stop_key (str): Key that ends the recording (not recorded itself)
+            move_interval (float): Minimum seconds between recorded mouse moves
+        """
+        self.stop_key = stop_key
+        self.move_interval = move_interval
+        self.events = []
+        self._held = set()
+        self._combined = set()  # Held modifiers that were used with another key
+        self._lock = threading.Lock()
+        self._start = None
+        self._last_move = 0.0
+
+    def _add(self, kind, *args):
+        with self._lock:
+            self.events.append([round(time.monotonic() - self._start, 3), kind, *args])
+
+    def _on_press(self, key):
+        name, is_char = _key_name(key)
+        if name is None:
+            return None
+        if name == self.stop_key:
+            return False  # Stops the keyboard listener
+
+        if name in MODIFIERS:
+            self._held.add(name)
+            return None
+
+        self._combined |= self._held
+        # Shift with a character is just the shifted character; with Tab,
+        # arrows, End etc. it changes what the key does
+        if self._held - {'shift'} or (self._held and not is_char):
+            self._add('hotkey', *sorted(self._held), name.lower() if is_char else name)
+        elif is_char:
+            self._add('char', name)
+        else:
+            self._add('press', name)
+        return None
+
+    def _on_release(self, key):
+        name, _ = _key_name(key)
+        if name in self._held and name not in self._combined:
+            # Pressed and released on its own, e.g. Win to open the Start menu
+            self._add('press', name)
+        self._held.discard(name)
+        self._combined.discard(name)
+
+    def _on_move(self, x, y):
+        now = time.monotonic()
+        if now - self._last_move >= self.move_interval:
+            self._last_move = now
+            self._add('move', x, y)
+
+    def _on_click(self, x, y, button, pressed):
+        # Releases are needed to tell a drag or text selection from a click
+        self._add('click' if pressed else 'release', x, y, button.name)
+
+    def _on_scroll(self, x, y, dx, dy):
+        self._add('scroll', x, y, dx, dy)
+
+    def record(self):
+        """
+        Record until the stop key is pressed
+
+        Returns:
+            list: Events as [seconds, kind, *arguments]
+        """
+        try:
+            from pynput import keyboard, mouse
+        except ImportError:
+            raise RuntimeError("Recording needs pynput - install it with: pip install pynput")
+
+        self.events = []
+        self._start = time.monotonic()
+        with mouse.Listener(on_move=self._on_move, on_click=self._on_click,
+                            on_scroll=self._on_scroll) as mouse_listener:
+            with keyboard.Listener(on_press=self._on_press,
+                                   on_release=self._on_release) as keyboard_listener:
+                keyboard_listener.join()
+            mouse_listener.stop()
+        return self.events
+
+
+def compile_macro(events, idle_gap=IDLE_GAP):
+    """
+    Compile recorded events into replay steps
+
+    Args:
+        events (list): Output of MacroRecorder.record()
+        idle_gap (float): Pauses longer than this become 'settle' steps
+
+    Returns:
+        list: Steps such as ['write', text], ['press', key, count],
+        ['click', x, y, button, count], ['mouse_down', x, y, button],
+        ['mouse_up', x, y, button], ['scroll', x, y, dx, dy] (wheel notches),
+        ['settle', max_seconds]
+    """
+    steps = []
+    last_time = 0.0
+    last_click_time = None
+    held = None  # Click step whose button has not been released yet
+
+    for event_time, kind, *args in events:
+        if kind == 'release':
+            x, y, button = args
+            # Released somewhere else: the click was really a drag or a selection
+            if held is not None and held[1:4] != [x, y, button]:
+                held[:] = ['mouse_down', *held[1:4]]
+                steps.append(['mouse_up', x, y, button])
+            held = None
+            continue
+
+        gap = event_time - last_time
+        last_time = event_time
+        if gap > idle_gap:
+            steps.append(['settle', round(gap, 2)])
+
+        previous = steps[-1] if steps else [None]
+
+        if kind == 'char':
+            if previous[0] == 'write':
+                previous[1] += args[0]
+            else:
+                steps.append(['write', args[0]])
+
+        elif kind == 'press':
+            if previous[0] == 'press' and previous[1] == args[0]:
+                previous[2] += 1
+            else:
+                steps.append(['press', args[0], 1])
+
+        elif kind == 'move':
+            # Only the end point of a run of moves matters
+            if previous[0] == 'move':
+                steps[-1] = ['move', *args]
+            else:
+                steps.append(['move', *args])
+
+        elif kind == 'click':
+            x, y, button = args
+            if (previous[0] == 'click' and previous[1:4] == [x, y, button]
+                    and event_time - last_click_time <= DOUBLE_CLICK_TIME):
+                previous[4] += 1
+                held = previous
+            else:
+                # click() moves the pointer itself
+                if previous[0] == 'move':
+                    steps.pop()
+                held = ['click', x, y, button, 1]
+                steps.append(held)
+            last_click_time = event_time
+
+        else:  # hotkey, scroll
+            steps.append([kind, *args])
+
+    return steps
+
+
+def save_macro(path, events=None, steps=None):
+    """
+    Write a recording and/or its compiled steps to a compact JSON file
+
+    Args:
+        path (str): Destination file
+        events (list): Raw recorded events
+        steps (list): Compiled steps
+    """
+    macro = {'version': MACRO_VERSION}
+    if events is not None:
+        macro['events'] = events
+    if steps is not None:
+        macro['steps'] = steps
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(macro, f, separators=(',', ':'))
+
+
+def load_macro(path, idle_gap=IDLE_GAP):
+    """
+    Load a macro file, compiling the recording if it has no steps yet
+
+    Args:
+        path (str): Macro file
+        idle_gap (float): Used when the file only holds a raw recording
+
+    Returns:
+        list: Replay steps
+    """
+    with open(path, encoding='utf-8') as f:
+        macro = json.load(f)
+    if macro.get('version') != MACRO_VERSION:
+        raise ValueError(f"{path}: unsupported macro version {macro.get('version')}")
+    if 'steps' in macro:
+        return macro['steps']
+    return compile_macro(macro.get('events', []), idle_gap)
+
+
+class MacroPlayer:
+    """Replays compiled steps at full speed with the fail-safe left on"""
+
+    def __init__(self, step_pause=0.02, quiet=0.25, grace=None, poll_interval=0.05):
+        """
+        Args:
+            step_pause (float): PyAutoGUI pause after each action
+            quiet (float): Seconds without screen changes that count as settled
+            grace (float): Give up waiting for a visible reaction after this many
+                seconds (None waits up to the recorded pause)
+            poll_interval (float): Seconds between screen grabs while settling
+        """
+        self.step_pause = step_pause
+        self.quiet = quiet
+        self.grace = grace
+        self.poll_interval = poll_interval
+        self._capture = None
+
+    @property
+    def capture(self):
+        """Frame capture service, created on the first readiness check"""
+        if self._capture is None:
+            from screen_capture import FrameCapture
+            self._capture = FrameCapture()
+        return self._capture
+
+    def settle(self, timeout, baseline=None):
+        """
+        Wait for the screen to react to the last action and then stop changing
+
+        Never waits longer than the pause that was recorded. With a grace
+        period set, an action that shows no reaction within it is taken to
+        have no visible effect and replay continues early.
+
+        Args:
+            timeout (float): Recorded pause in seconds
+            baseline (dict): Tile hashes from before the last action
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        if baseline is None:
+            baseline = self.capture.grab().tiles
+
+        # The reaction may already be on screen, so compare the first grab too
+        while True:
+            tiles = self.capture.grab().tiles
+            if any(baseline.get(key) != value for key, value in tiles.items()):
+                break
+            if time.monotonic() - start >= min(self.grace or timeout, timeout):
+                return
+            time.sleep(self.poll_interval)
+
+        quiet_since = time.monotonic()
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            if self.capture.grab().changed:
+                quiet_since = time.monotonic()
+            elif time.monotonic() - quiet_since >= self.quiet:
+                return
+
+    def run(self, steps):
+        """
+        Replay compiled steps
+
+        Args:
+            steps (list): Output of compile_macro()
+        """
+        pyautogui.PAUSE = self.step_pause
+        baseline = None
+
+        for index, (kind, *args) in enumerate(steps):
+            if index + 1 < len(steps) and steps[index + 1][0] == 'settle' and kind != 'settle':
+                # Fresh grab right before the action: a reaction within milliseconds
+                # still counts, and earlier steps' changes don't pass for one
+                baseline = self.capture.grab().tiles
+
+            if kind == 'write':
+                pyautogui.write(args[0], interval=0)
+            elif kind == 'press':
+                pyautogui.press(args[0], presses=args[1])
+            elif kind == 'hotkey':
+                pyautogui.hotkey(*args)
+            elif kind == 'move':
+                pyautogui.moveTo(*args)
+            elif kind == 'click':
+                x, y, button, count = args
+                pyautogui.click(x, y, clicks=count, button=button)
+            elif kind == 'mouse_down':
+                x, y, button = args
+                pyautogui.mouseDown(x, y, button=button)
+            elif kind == 'mouse_up':
+                x, y, button = args
+                pyautogui.mouseUp(x, y, button=button)
+            elif kind == 'scroll':
+                x, y, dx, dy = args
+                if dy:
+                    pyautogui.scroll(dy * WHEEL_DELTA, x=x, y=y)
+                if dx:
+                    pyautogui.hscroll(dx * WHEEL_DELTA, x=x, y=y)
+            elif kind == 'settle':
+                self.settle(args[0], baseline)
+                baseline = None
+            else:
+                raise ValueError(f"Unknown macro step: {kind}")
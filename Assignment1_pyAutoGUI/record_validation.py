@@ -0,0 +1,165 @@
+"""
+Pre-validation and normalization of form records
+Runs vectorized over the whole input table before any UI work, so bad rows
+are rejected in milliseconds instead of after the bot has typed them
+"""
+
+import os
+
+import pandas as pd
+
+from form_filler import FORM_FIELDS
+
+# Maximum characters accepted per field, where the form has it
+# (empty values are always rejected)
+MAX_LENGTHS = {
+    'Name': 100,
+    'Email': 254,
+    'Message': 1000,
+}
+
+EMAIL_PATTERN = r"[^@\s]+@[^@\s]+\.[A-Za-z]{2,}"
+
+# Phone numbers may contain 7-15 digits (E.164 limit) once punctuation is removed
+MIN_PHONE_DIGITS = 7
+MAX_PHONE_DIGITS = 15
+PHONE_PATTERN = r"\+?[\d\s().-]+"
+
+REJECT_REASON_COLUMN = 'Reject Reason'
+ROW_COLUMN = 'Row'
+
+
+def _as_text(column):
+    """
+    Convert a column to pandas string dtype without float artefacts
+
+    Excel cells holding phone numbers are often read back as floats,
+    which would otherwise turn 5552345678 into '5552345678.0'.
+    """
+    if pd.api.types.is_float_dtype(column):
+        whole = column.dropna() % 1 == 0
+        if whole.all():
+            column = column.astype('Int64')
+    return column.astype('string')
+
+
+def normalize_records(data):
+    """
+    Normalize whitespace and case of every form field
+
+    Args:
+        data (DataFrame): Records with a column for each of FORM_FIELDS
+
+    Returns:
+        DataFrame: Normalized copy of the records
+    """
+    missing = [column for column in FORM_FIELDS if column not in data.columns]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    records = data.copy()
+    for column in FORM_FIELDS:
+        records[column] = (
+            _as_text(records[column])
+            .str.strip()
+            .str.replace(r'\s+', ' ', regex=True)
+        )
+
+    if 'Name' in FORM_FIELDS:
+        # Title-case names typed in all upper or all lower case, keep mixed case as is
+        name = records['Name']
+        single_case = name.str.islower() | name.str.isupper()
+        records['Name'] = name.mask(single_case.fillna(False), name.str.title())
+
+    if 'Email' in FORM_FIELDS:
+        records['Email'] = records['Email'].str.lower()
+
+    # Phone numbers are typed exactly as entered; the form owner decides the format
+    return records
+
+
+def validate_records(data):
+    """
+    Split normalized records into valid and rejected rows
+
+    Args:
+        data (DataFrame): Output of normalize_records()
+
+    Returns:
+        tuple: (valid DataFrame, rejected DataFrame with Row and Reject Reason)
+    """
+    missing = {
+        column: data[column].isna() | (data[column] == '')
+        for column in FORM_FIELDS
+    }
+    if 'Phone' in FORM_FIELDS:
+        digit_count = data['Phone'].str.count(r'\d').fillna(0)
+        missing['Phone'] = digit_count == 0
+
+    checks = {f'missing {column.lower()}': mask for column, mask in missing.items()}
+    # Only call a value invalid when there is one; empty cells are reported as missing
+    if 'Email' in FORM_FIELDS:
+        checks['invalid email'] = ~missing['Email'] & ~data['Email'].str.fullmatch(EMAIL_PATTERN)
+    if 'Phone' in FORM_FIELDS:
+        checks['invalid phone'] = ~missing['Phone'] & (
+            (digit_count < MIN_PHONE_DIGITS) | (digit_count > MAX_PHONE_DIGITS)
+            | ~data['Phone'].str.fullmatch(PHONE_PATTERN)
+        )
+    for column, limit in MAX_LENGTHS.items():
+        if column in FORM_FIELDS:
+            too_long = data[column].str.len() > limit
+            checks[f'{column.lower()} longer than {limit} characters'] = too_long
+
+    checks['duplicate row'] = data.duplicated(subset=FORM_FIELDS, keep='first')
+
+    reasons = pd.Series('', index=data.index, dtype='string')
+    for reason, failed in checks.items():
+        failed = failed.fillna(False).astype(bool)
+        reasons = reasons.mask(failed, reasons + reason + '; ')
+
+    rejected_mask = reasons != ''
+
+    rejected = data[rejected_mask].copy()
+    # Excel row number: one-based, plus the header row
+    rejected.insert(0, ROW_COLUMN, rejected.index + 2)
+    rejected[REJECT_REASON_COLUMN] = reasons[rejected_mask].str.rstrip('; ')
+
+    return data[~rejected_mask], rejected
+
+
+def write_rejects(rejected, path):
+    """
+    Write rejected records to a CSV or Excel file (chosen by extension)
+
+    Args:
+        rejected (DataFrame): Output of validate_records()
+        path (str): Destination file (.csv, .xlsx)
+    """
+    if os.path.splitext(path)[1].lower() in ('.xlsx', '.xlsm'):
+        rejected.to_excel(path, index=False, engine='openpyxl')
+    else:
+        rejected.to_csv(path, index=False)
+
+
+def prepare_records(data, rejects_file=None):
+    """
+    Normalize and validate records, writing any rejects to disk
+
+    Args:
+        data (DataFrame): Raw records loaded from Excel
+        rejects_file (str): Where to write rejected rows (None to skip)
+
+    Returns:
+        DataFrame: Records that are safe to type into the form
+    """
+    valid, rejected = validate_records(normalize_records(data))
+
+    print(f"✓ Validated {len(data)} records: {len(valid)} ok, {len(rejected)} rejected")
+    if len(rejected):
+        for reason, count in rejected[REJECT_REASON_COLUMN].value_counts().items():
+            print(f"  ✗ {count} x {reason}")
+        if rejects_file:
+            write_rejects(rejected, rejects_file)
+            print(f"  → Rejected rows saved to: {rejects_file}")
+
+    return valid
@@ -0,0 +1,217 @@
+"""
+Frame capture service with screen-state diffing
+Grabs only the screen region a caller cares about, hashes it in fixed tiles
+and remembers what each tile looked like. Image searches against tiles that
+have not changed are answered from cache, and callers can subscribe to
+"region changed" events instead of re-running template matching in a loop.
+"""
+
+import collections
+import time
+import zlib
+
+import pyautogui
+
+Frame = collections.namedtuple('Frame', ['timestamp', 'region', 'image', 'tiles', 'changed'])
+
+
+class FrameCapture:
+    """Region-limited screenshots with tile hashing and a locate cache"""
+
+    def __init__(self, tile_size=64, history=8):
+        """
+        Args:
+            tile_size (int): Edge length of the square hash tiles in pixels
+            history (int): Number of recent frames to keep (hashes only)
+        """
+        self.tile_size = tile_size
+        self.screen_size = tuple(pyautogui.size())
+        self.history = collections.deque(maxlen=history)
+        self.tiles = {}  # (column, row) -> hash of the last grab covering that tile
+        self.subscribers = {}
+        self.stats = {'grabs': 0, 'locates': 0, 'cache_hits': 0, 'events': 0}
+        self._locate_cache = {}
+        self._next_token = 0
+
+    def _align(self, region):
+        """Expand (left, top, width, height) to tile boundaries, clipped to the screen"""
+        screen_width, screen_height = self.screen_size
+        if region is None:
+            return (0, 0, screen_width, screen_height)
+
+        size = self.tile_size
+        left, top, width, height = (int(value) for value in region)
+        x0 = max(0, left // size * size)
+        y0 = max(0, top // size * size)
+        x1 = min(screen_width, -(-(left + width) // size) * size)
+        y1 = min(screen_height, -(-(top + height) // size) * size)
+        return (x0, y0, max(0, x1 - x0), max(0, y1 - y0))
+
+    def _hash_tiles(self, image, region):
+        """Hash every tile of an aligned grab, keyed by absolute tile position"""
+        left, top, width, height = region
+        size = self.tile_size
+        tiles = {}
+        for y in range(0, height, size):
+            for x in range(0, width, size):
+                box = (x, y, min(x + size, width), min(y + size, height))
+                tiles[((left + x) // size, (top + y) // size)] = zlib.crc32(image.crop(box).tobytes())
+        return tiles
+
+    def grab(self, region=None):
+        """
+        Capture a region, update the tile state and notify subscribers
+
+        Args:
+            region (tuple): (left, top, width, height), None for the whole screen
+
+        Returns:
+            Frame: Captured frame; ``changed`` holds the tiles that differ from
+            the previous grab of the same area
+        """
+        region = self._align(region)
+        image = pyautogui.screenshot(region=region)
+        tiles = self._hash_tiles(image, region)
+        # A tile seen for the first time is a baseline, not a change
+        changed = {key for key, value in tiles.items()
+                   if key in self.tiles and self.tiles[key] != value}
+
+        self.tiles.update(tiles)
+        self.stats['grabs'] += 1
+        frame = Frame(time.time(), region, image, tiles, changed)
+        # Keep hashes only; full images would make the history several MB per frame
+        self.history.append(frame._replace(image=None))
+
+        self._notify(frame)
+        return frame
+
+    def locate(self, image_path, region=None, confidence=0.8):
+        """
+        Find an image on screen, reusing the last answer if the region is unchanged
+
+        Args:
+            image_path (str): Path to screenshot of element
+            region (tuple): Area to search, None for the whole screen
+            confidence (float): Matching confidence (0-1)
+
+        Returns:
+            Box: Location in screen coordinates, or None if not found
+        """
+        frame = self.grab(region)
+        key = (image_path, confidence, frame.region)
+
+        cached = self._locate_cache.get(key)
+        if cached and cached[0] == frame.tiles:
+            self.stats['cache_hits'] += 1
+            return cached[1]
+
+        self.stats['locates'] += 1
+        try:
+            box = pyautogui.locate(image_path, frame.image, confidence=confidence)
+        except pyautogui.ImageNotFoundException:
+            box = None
+
+        location = None
+        if box:
+            left, top = frame.region[:2]
+            location = pyautogui.Box(left + box.left, top + box.top, box.width, box.height)
+
+        self._locate_cache[key] = (frame.tiles, location)
+        return location
+
+    def wait_for_image(self, image_path, region=None, confidence=0.8, timeout=10, interval=0.25):
+        """
+        Poll until an image appears; template matching only reruns when the region changes
+
+        Args:
+            image_path (str): Path to screenshot of element
+            region (tuple): Area to search, None for the whole screen
+            confidence (float): Matching confidence (0-1)
+            timeout (float): Seconds to wait
+            interval (float): Seconds between grabs
+
+        Returns:
+            Box: Location in screen coordinates, or None on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            location = self.locate(image_path, region, confidence)
+            if location or time.monotonic() >= deadline:
+                return location
+            time.sleep(interval)
+
+    def wait_for_change(self, region=None, timeout=10, interval=0.25):
+        """
+        Block until something inside a region changes
+
+        Args:
+            region (tuple): Area to watch, None for the whole screen
+            timeout (float): Seconds to wait
+            interval (float): Seconds between grabs
+
+        Returns:
+            Frame: First frame that differs, or None on timeout
+        """
+        baseline = self.grab(region).tiles
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            time.sleep(interval)
+            frame = self.grab(region)
+            if any(baseline.get(key) != value for key, value in frame.tiles.items()):
+                return frame
+        return None
+
+    def subscribe(self, callback, region=None):
+        """
+        Call ``callback(frame, changed_tiles)`` whenever a grab shows the region changed
+
+        Args:
+            callback (callable): Event handler
+            region (tuple): Area to watch, None for the whole screen
+
+        Returns:
+            int: Token for unsubscribe()
+        """
+        region = self._align(region)
+        size = self.tile_size
+        left, top, width, height = region
+        keys = {
+            (column, row)
+            for column in range(left // size, -(-(left + width) // size))
+            for row in range(top // size, -(-(top + height) // size))
+        }
+
+        self._next_token += 1
+        self.subscribers[self._next_token] = (callback, region, keys)
+        return self._next_token
+
+    def unsubscribe(self, token):
+        """Stop delivering events to a subscriber"""
+        self.subscribers.pop(token, None)
+
+    def poll(self):
+        """
+        Grab the smallest area covering every subscription so events fire
+
+        Returns:
+            Frame: Captured frame, or None if nobody is subscribed
+        """
+        if not self.subscribers:
+            return None
+
+        regions = [region for _, region, _ in self.subscribers.values()]
+        left = min(region[0] for region in regions)
+        top = min(region[1] for region in regions)
+        right = max(region[0] + region[2] for region in regions)
+        bottom = max(region[1] + region[3] for region in regions)
+        return self.grab((left, top, right - left, bottom - top))
+
+    def _notify(self, frame):
+        """Deliver a frame to subscribers whose tiles changed in it"""
+        if not frame.changed:
+            return
+        for callback, _, keys in list(self.subscribers.values()):
+            hit = keys & frame.changed
+            if hit:
+                self.stats['events'] += 1
+                callback(frame, hit)
@@ -0,0 +1,73 @@
+"""
+Screen size and mouse position without importing PyAutoGUI
+Importing pyautogui pulls in Pillow, pyscreeze and the message box and
+screenshot backends, which takes well over 100 ms. Reading two numbers only
+needs one native call each, so the quick screen-info command asks the
+platform directly through ctypes and falls back to pyautogui elsewhere.
+"""
+
+import ctypes
+import os
+import sys
+
+
+def _windows_metrics():
+    """Screen size and cursor position from user32"""
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32
+    # pyautogui does the same, so both report physical pixels on scaled displays
+    user32.SetProcessDPIAware()
+    point = wintypes.POINT()
+    user32.GetCursorPos(ctypes.byref(point))
+    return (user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)), (point.x, point.y)
+
+
+def _x11_metrics():
+    """Screen size and pointer position from libX11, None if no display is reachable"""
+    try:
+        xlib = ctypes.CDLL('libX11.so.6')
+    except OSError:
+        return None
+
+    xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    xlib.XOpenDisplay.restype = ctypes.c_void_p
+    xlib.XDefaultScreen.argtypes = [ctypes.c_void_p]
+    xlib.XDisplayWidth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    xlib.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    xlib.XRootWindow.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    xlib.XRootWindow.restype = ctypes.c_ulong
+    xlib.XQueryPointer.argtypes = [ctypes.c_void_p, ctypes.c_ulong] + [ctypes.c_void_p] * 7
+    xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+
+    display = xlib.XOpenDisplay(None)
+    if not display:
+        return None
+    try:
+        screen = xlib.XDefaultScreen(display)
+        size = (xlib.XDisplayWidth(display, screen), xlib.XDisplayHeight(display, screen))
+        root, child = ctypes.c_ulong(), ctypes.c_ulong()
+        root_x, root_y, win_x, win_y = (ctypes.c_int() for _ in range(4))
+        mask = ctypes.c_uint()
+        xlib.XQueryPointer(display, xlib.XRootWindow(display, screen),
+                           ctypes.byref(root), ctypes.byref(child),
+                           ctypes.byref(root_x), ctypes.byref(root_y),
+                           ctypes.byref(win_x), ctypes.byref(win_y), ctypes.byref(mask))
+        return size, (root_x.value, root_y.value)
+    finally:
+        xlib.XCloseDisplay(display)
+
+
+def screen_metrics():
+    """
+    Screen size and current mouse position
+
+    Returns:
+        tuple: ((width, height), (x, y)), or None when the platform has no
+        native reader here (macOS) and pyautogui should be used instead
+    """
+    if sys.platform == 'win32':
+        return _windows_metrics()
+    if os.environ.get('DISPLAY'):
+        return _x11_metrics()
+    return None
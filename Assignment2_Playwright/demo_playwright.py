@@ -4,12 +4,22 @@ This script demonstrates web scraping and automation with Playwright
 Real-world use case: Track product prices across multiple websites
 """
 
+import argparse
 import asyncio
-from playwright.async_api import async_playwright
-import pandas as pd
-from datetime import datetime
 import json
 import os
+import sys
+import time
+
+from excel_export import PREVIEW_ROWS, export_records, print_preview, record_rows, write_rows
+from network_capture import NetworkCapture
+from page_lifecycle import PageLifecycle
+from result_records import ArticleResult, ProductResult
+from selector_registry import DEFAULT_STATS_FILE, SelectorHealthError, SelectorRegistry
+
+# Playwright and xlsxwriter are imported inside the functions that use them, so
+# the CLI (--help, argument errors, config loading) starts without paying for
+# the browser driver or the spreadsheet stack.
 
 class PriceTrackerBot:
     """
@@ -17,46 +27,105 @@ class PriceTrackerBot:
     Monitors product prices and saves results to Excel
     """
     
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, slow_mo=500, min_hit_rate=0.5,
+                 selector_stats=DEFAULT_STATS_FILE, max_navigations=50, max_rss_mb=None):
         """
         Initialize the bot
         
         Args:
             headless (bool): Run browser in headless mode (no GUI)
+            slow_mo (int): Milliseconds to slow each browser action down by
+            min_hit_rate (float): Abort extraction when a field matches less often (0 disables)
+            selector_stats (str): JSON file tracking selector hit rates across runs
+            max_navigations (int): Navigations before the page is replaced with a fresh one
+            max_rss_mb (int): Memory ceiling for the whole process tree (None for no limit)
         """
         self.headless = headless
+        self.slow_mo = slow_mo
+        self.playwright = None
         self.browser = None
         self.context = None
         self.page = None
-        self.results = []
+        self.results = []  # ProductResult / ArticleResult records
+        self.selectors = SelectorRegistry(selector_stats, min_hit_rate=min_hit_rate)
+        self.observers = []  # Objects with attach(page)/detach(), moved along on recycling
+        self.lifecycle = PageLifecycle(self, max_navigations=max_navigations,
+                                       max_rss_mb=max_rss_mb)
         
     async def initialize(self):
         """Start the browser and create a new page"""
+        from playwright.async_api import async_playwright
+
         print("🚀 Initializing Playwright browser...")
         
         # Launch browser
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(
             headless=self.headless,
-            slow_mo=500  # Slow down by 500ms for visibility
+            slow_mo=self.slow_mo  # Slow down actions for visibility
         )
         
         # Create browser context (like an incognito session)
-        self.context = await self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        )
+        self.context = await self.new_context()
         
         # Create a new page
         self.page = await self.context.new_page()
         
+        # Count navigations from clicks and key presses too, not just goto()
+        self.observe(self.lifecycle)
+        
         print("✓ Browser initialized successfully!")
+    
+    async def new_context(self, storage_state=None):
+        """
+        Create a browser context with the bot's viewport and user agent
+        
+        Args:
+            storage_state (dict): Cookies and local storage to start with
+        """
+        return await self.browser.new_context(
+            viewport={'width': 1920, 'height': 1080},
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            storage_state=storage_state,
+        )
+    
+    async def goto(self, url, **kwargs):
+        """
+        Navigate the current page, recycling it first if a lifecycle limit was reached
+        
+        Args:
+            url (str): Page to open
+            **kwargs: Passed to page.goto()
+        """
+        await self.lifecycle.before_navigation()
+        return await self.page.goto(url, **kwargs)
+    
+    def observe(self, observer):
+        """Attach an observer (e.g. NetworkCapture) that follows the bot across page recycling"""
+        observer.attach(self.page)
+        self.observers.append(observer)
+    
+    def unobserve(self, observer):
+        """Detach an observer and stop moving it to new pages"""
+        observer.detach()
+        self.observers.remove(observer)
         
     async def close(self):
-        """Clean up and close the browser"""
+        """Clean up, record selector health and close the browser"""
+        self.selectors.print_summary()
+        self.selectors.save()
+        
+        for observer in list(self.observers):
+            self.unobserve(observer)
+        
         if self.browser:
+            self.lifecycle.print_summary()
             await self.browser.close()
             print("✓ Browser closed")
+        
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
     
     async def search_amazon_demo(self, product_name):
         """
@@ -70,7 +139,7 @@ class PriceTrackerBot:
         try:
             # Navigate to demo e-commerce site (using a test site)
             print("  → Navigating to demo e-commerce site...")
-            await self.page.goto('https://demo.playwright.dev/ecommerce/', 
+            await self.goto('https://demo.playwright.dev/ecommerce/', 
                                  wait_until='networkidle',
                                  timeout=30000)
             
@@ -89,61 +158,59 @@ class PriceTrackerBot:
             print(f"  ✗ Error: {e}")
             return False
     
-    async def scrape_demo_products(self):
+    async def scrape_demo_products(self, limit=5):
         """
         Scrape products from demo e-commerce site
         Demonstrates various Playwright selectors and interactions
+        
+        Args:
+            limit (int): Maximum number of products to extract (None for all)
         """
         print("\n📊 Scraping product information...")
         
         try:
             # Visit demo shopping site
-            await self.page.goto('https://webscraper.io/test-sites/e-commerce/static', 
+            await self.goto('https://webscraper.io/test-sites/e-commerce/static', 
                                  wait_until='networkidle')
             
             print("  → Analyzing page structure...")
             
             # Wait for products to load
-            await self.page.wait_for_selector('.product-wrapper', timeout=10000)
+            await self.selectors.wait_for(self.page, 'product.card', timeout=10000)
             
             # Get all product elements
-            products = await self.page.query_selector_all('.product-wrapper')
+            products = await self.selectors.query_all(self.page, 'product.card')
             
             print(f"  → Found {len(products)} products")
             
             # Extract data from each product
-            for idx, product in enumerate(products[:5], 1):  # Limit to 5 for demo
+            for idx, product in enumerate(products[:limit], 1):
                 try:
-                    # Extract product name
-                    name_element = await product.query_selector('.title')
-                    name = await name_element.inner_text() if name_element else "N/A"
-                    
-                    # Extract price
-                    price_element = await product.query_selector('.price')
-                    price = await price_element.inner_text() if price_element else "N/A"
-                    
-                    # Extract description
-                    desc_element = await product.query_selector('.description')
-                    description = await desc_element.inner_text() if desc_element else "N/A"
+                    # Extract name, price and description (with fallback selectors)
+                    name = await self.selectors.text(product, 'product.name')
+                    price = await self.selectors.text(product, 'product.price')
+                    description = await self.selectors.text(product, 'product.description')
                     
                     # Store result
-                    product_data = {
-                        'Product Name': name.strip(),
-                        'Price': price.strip(),
-                        'Description': description.strip()[:50] + "...",
-                        'Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'Source': 'Demo E-Commerce Site'
-                    }
-                    
-                    self.results.append(product_data)
+                    self.results.append(ProductResult(
+                        name=name.strip(),
+                        price=price.strip(),
+                        description=description.strip()[:50] + "...",
+                        source='Demo E-Commerce Site',
+                        timestamp=time.time(),
+                    ))
                     print(f"  ✓ Product {idx}: {name.strip()} - {price.strip()}")
                     
+                except SelectorHealthError:
+                    raise
                 except Exception as e:
                     print(f"  ⚠ Error extracting product {idx}: {e}")
                     continue
             
             return True
             
+        except SelectorHealthError:
+            raise
         except Exception as e:
             print(f"  ✗ Error during scraping: {e}")
             return False
@@ -161,7 +228,7 @@ class PriceTrackerBot:
         try:
             # Go to Wikipedia
             print("  → Navigating to Wikipedia...")
-            await self.page.goto('https://www.wikipedia.org/', wait_until='networkidle')
+            await self.goto('https://www.wikipedia.org/', wait_until='networkidle')
             
             # Find search box and type
             print("  → Filling search form...")
@@ -177,31 +244,29 @@ class PriceTrackerBot:
             print("  → Extracting article information...")
             
             # Get the title
-            title_element = await self.page.query_selector('#firstHeading')
-            title = await title_element.inner_text() if title_element else "N/A"
+            title = await self.selectors.text(self.page, 'wikipedia.title')
             
             # Get first paragraph
-            first_para = await self.page.query_selector('.mw-parser-output > p')
-            content = await first_para.inner_text() if first_para else "N/A"
+            content = await self.selectors.text(self.page, 'wikipedia.paragraph')
             
             # Take screenshot
             await self.page.screenshot(path=f'screenshots/wikipedia_{search_term.replace(" ", "_")}.png')
             
-            result = {
-                'Search Term': search_term,
-                'Article Title': title,
-                'First Paragraph': content[:200] + "...",
-                'URL': self.page.url,
-                'Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            
-            self.results.append(result)
+            self.results.append(ArticleResult(
+                search_term=search_term,
+                title=title,
+                first_paragraph=content[:200] + "...",
+                url=self.page.url,
+                timestamp=time.time(),
+            ))
             
             print(f"  ✓ Found: {title}")
             print(f"  ✓ URL: {self.page.url}")
             
             return True
             
+        except SelectorHealthError:
+            raise
         except Exception as e:
             print(f"  ✗ Error: {e}")
             return False
@@ -219,7 +284,7 @@ class PriceTrackerBot:
         try:
             # Navigate to a demo form (using httpbin for testing)
             print("  → Loading demo form...")
-            await self.page.goto('https://demoqa.com/automation-practice-form', 
+            await self.goto('https://demoqa.com/automation-practice-form', 
                                  wait_until='networkidle')
             
             # Fill First Name
@@ -270,7 +335,7 @@ class PriceTrackerBot:
         try:
             # Go to demo login page
             print("  → Navigating to login page...")
-            await self.page.goto('https://the-internet.herokuapp.com/login', 
+            await self.goto('https://the-internet.herokuapp.com/login', 
                                  wait_until='networkidle')
             
             # Fill username
@@ -314,39 +379,38 @@ class PriceTrackerBot:
             print(f"  ✗ Error during login: {e}")
             return False
     
-    async def intercept_network_requests(self):
+    async def intercept_network_requests(self, url='https://socialeagle.ai',
+                                         har_path='network_requests.har'):
         """
         Demonstrate network request interception
         Useful for monitoring API calls, blocking resources, etc.
-        """
-        print("\n🌐 Setting up network monitoring...")
-        
-        captured_requests = []
         
-        # Listen to all requests
-        async def handle_request(request):
-            captured_requests.append({
-                'url': request.url,
-                'method': request.method,
-                'resource_type': request.resource_type
-            })
-            print(f"  📡 Request: {request.method} {request.resource_type} - {request.url[:80]}")
-        
-        self.page.on('request', handle_request)
+        Args:
+            url (str): Page to load
+            har_path (str): HAR file receiving one entry per request
         
-        # Visit a page to capture requests
-        print("  → Loading page to capture network traffic...")
-        await self.page.goto('https://socialeagle.ai', wait_until='networkidle')
+        Returns:
+            dict: Totals with per-domain and per-resource-type statistics
+        """
+        print("\n🌐 Setting up network monitoring...")
         
-        print(f"\n  ✓ Captured {len(captured_requests)} network requests")
+        # Entries stream to disk as requests finish; only aggregates stay in memory
+        capture = NetworkCapture(har_path)
+        self.observe(capture)
         
-        # Save to JSON
-        with open('network_requests.json', 'w') as f:
-            json.dump(captured_requests, f, indent=2)
+        try:
+            # Visit a page to capture requests
+            print("  → Loading page to capture network traffic...")
+            await self.goto(url, wait_until='networkidle')
+        finally:
+            self.unobserve(capture)
+            await capture.drain()
+            capture.close()
         
-        print("  ✓ Network data saved to: network_requests.json")
+        capture.print_summary()
+        print(f"  ✓ Network data saved to: {har_path}")
         
-        return captured_requests
+        return capture.summary()
     
     def save_results_to_excel(self, filename='price_tracker_results.xlsx'):
         """
@@ -362,12 +426,12 @@ class PriceTrackerBot:
         try:
             print(f"\n💾 Saving {len(self.results)} results to Excel...")
             
-            df = pd.DataFrame(self.results)
-            df.to_excel(filename, index=False, engine='openpyxl')
+            # Rows stream into a constant-memory workbook; no DataFrame is built
+            header, written = export_records(self.results, filename)
             
             print(f"  ✓ Results saved to: {filename}")
-            print(f"\n📊 Summary:")
-            print(df.to_string(index=False))
+            print(f"\n📊 Summary ({written} rows):")
+            print_preview(header, record_rows(self.results[:PREVIEW_ROWS], header), written)
             
             return True
             
@@ -376,18 +440,24 @@ class PriceTrackerBot:
             return False
 
 
-async def demo_basic_navigation():
+async def demo_basic_navigation(headless=False, slow_mo=500):
     """
     Demo 1: Basic Navigation and Screenshot
     Shows fundamental Playwright operations
+    
+    Args:
+        headless (bool): Run browser in headless mode
+        slow_mo (int): Milliseconds to slow down operations
     """
     print("\n" + "="*60)
     print("DEMO 1: Basic Navigation and Screenshots")
     print("="*60)
     
+    from playwright.async_api import async_playwright
+    
     async with async_playwright() as p:
         # Launch browser
-        browser = await p.chromium.launch(headless=False, slow_mo=500)
+        browser = await p.chromium.launch(headless=headless, slow_mo=slow_mo)
         page = await browser.new_page()
         
         # Navigate to a page
@@ -414,17 +484,23 @@ async def demo_basic_navigation():
         print("✓ Demo 1 completed!")
 
 
-async def demo_form_interaction():
+async def demo_form_interaction(headless=False, slow_mo=500):
     """
     Demo 2: Form Interaction
     Shows how to interact with web forms
+    
+    Args:
+        headless (bool): Run browser in headless mode
+        slow_mo (int): Milliseconds to slow down operations
     """
     print("\n" + "="*60)
     print("DEMO 2: Form Interaction")
     print("="*60)
     
+    from playwright.async_api import async_playwright
+    
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False, slow_mo=500)
+        browser = await p.chromium.launch(headless=headless, slow_mo=slow_mo)
         page = await browser.new_page()
         
         # Go to DuckDuckGo (search engine)
@@ -444,8 +520,10 @@ async def demo_form_interaction():
         
         # Get search results
         print("→ Analyzing search results...")
-        results = await page.query_selector_all('.result')
+        selectors = SelectorRegistry()
+        results = await selectors.query_all(page, 'search.result')
         print(f"→ Found {len(results)} search results")
+        selectors.save()
         
         # Take screenshot
         await page.screenshot(path='screenshots/search_results.png')
@@ -456,17 +534,23 @@ async def demo_form_interaction():
         print("✓ Demo 2 completed!")
 
 
-async def demo_data_extraction():
+async def demo_data_extraction(headless=False, slow_mo=500):
     """
     Demo 3: Data Extraction
     Shows how to scrape data from web pages
+    
+    Args:
+        headless (bool): Run browser in headless mode
+        slow_mo (int): Milliseconds to slow down operations
     """
     print("\n" + "="*60)
     print("DEMO 3: Data Extraction")
     print("="*60)
     
+    from playwright.async_api import async_playwright
+    
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False, slow_mo=500)
+        browser = await p.chromium.launch(headless=headless, slow_mo=slow_mo)
         page = await browser.new_page()
         
         # Visit quotes website
@@ -493,8 +577,8 @@ async def demo_data_extraction():
             print(f"  {i}. {text[:50]}... - {author}")
         
         # Save to Excel
-        df = pd.DataFrame(extracted_data)
-        df.to_excel('quotes_data.xlsx', index=False)
+        write_rows('quotes_data.xlsx', ['Quote', 'Author'],
+                   ((row['Quote'], row['Author']) for row in extracted_data))
         print(f"\n→ Saved {len(extracted_data)} quotes to: quotes_data.xlsx")
         
         await asyncio.sleep(2)
@@ -502,8 +586,147 @@ async def demo_data_extraction():
         print("✓ Demo 3 completed!")
 
 
-async def main():
-    """Main execution function with menu"""
+async def run_scrape(output='tracker_results.xlsx', limit=5, headless=False, slow_mo=500,
+                     min_hit_rate=0.5, selector_stats=DEFAULT_STATS_FILE,
+                     max_navigations=50, max_rss_mb=None):
+    """
+    Scrape the demo product catalogue and save it to Excel
+    
+    Args:
+        output (str): Excel file to write
+        limit (int): Maximum number of products to extract (None for all)
+        headless (bool): Run browser in headless mode
+        slow_mo (int): Milliseconds to slow each browser action down by
+        min_hit_rate (float): Abort when a field matches less often (0 disables)
+        selector_stats (str): JSON file tracking selector hit rates across runs
+        max_navigations (int): Navigations before the page is replaced with a fresh one
+        max_rss_mb (int): Memory ceiling for the whole process tree (None for no limit)
+    
+    Returns:
+        int: Process exit code (2 if aborted by the selector health check)
+    """
+    bot = PriceTrackerBot(headless=headless, slow_mo=slow_mo, min_hit_rate=min_hit_rate,
+                          selector_stats=selector_stats, max_navigations=max_navigations,
+                          max_rss_mb=max_rss_mb)
+    await bot.initialize()
+    
+    try:
+        ok = await bot.scrape_demo_products(limit=limit)
+        saved = bot.save_results_to_excel(output)
+    except SelectorHealthError as e:
+        print(f"\n✗ Aborting scrape: {e}")
+        return 2
+    finally:
+        await bot.close()
+    
+    return 0 if ok and saved else 1
+
+
+async def run_crawl(search_terms, output='tracker_results.xlsx', limit=5,
+                    headless=False, slow_mo=500, delay=2.0, min_hit_rate=0.5,
+                    selector_stats=DEFAULT_STATS_FILE, max_navigations=50, max_rss_mb=None):
+    """
+    Complete price tracker run: scrape products, search Wikipedia, save results
+    
+    Args:
+        search_terms (list): Terms to look up on Wikipedia
+        output (str): Excel file to write
+        limit (int): Maximum number of products to extract (None for all)
+        headless (bool): Run browser in headless mode
+        slow_mo (int): Milliseconds to slow each browser action down by
+        delay (float): Seconds to pause between steps
+        min_hit_rate (float): Abort when a field matches less often (0 disables)
+        selector_stats (str): JSON file tracking selector hit rates across runs
+        max_navigations (int): Navigations before the page is replaced with a fresh one
+        max_rss_mb (int): Memory ceiling for the whole process tree (None for no limit)
+    
+    Returns:
+        int: Process exit code (2 if aborted by the selector health check)
+    """
+    print("\n→ Running complete price tracker demo...")
+    
+    # Initialize bot
+    bot = PriceTrackerBot(headless=headless, slow_mo=slow_mo, min_hit_rate=min_hit_rate,
+                          selector_stats=selector_stats, max_navigations=max_navigations,
+                          max_rss_mb=max_rss_mb)
+    await bot.initialize()
+    
+    try:
+        # Demo 1: Scrape products
+        scraped = await bot.scrape_demo_products(limit=limit)
+        
+        # Demo 2: Wikipedia search
+        for term in search_terms:
+            await asyncio.sleep(delay)
+            await bot.search_wikipedia(term)
+        
+        # Save results
+        saved = bot.save_results_to_excel(output)
+        
+    except SelectorHealthError as e:
+        print(f"\n✗ Aborting crawl: {e}")
+        return 2
+    finally:
+        await bot.close()
+    
+    print("\n✓ Complete demo finished!")
+    return 0 if scraped and saved else 1
+
+
+async def run_login(username, password, headless=False, slow_mo=500):
+    """
+    Run the login workflow demo
+    
+    Args:
+        username (str): Username for login
+        password (str): Password for login
+        headless (bool): Run browser in headless mode
+        slow_mo (int): Milliseconds to slow each browser action down by
+    
+    Returns:
+        int: Process exit code
+    """
+    print("\n→ Running login workflow demo...")
+    
+    bot = PriceTrackerBot(headless=headless, slow_mo=slow_mo)
+    await bot.initialize()
+    
+    try:
+        ok = await bot.test_login_workflow(username, password)
+    finally:
+        await bot.close()
+    
+    print("\n✓ Login demo completed!")
+    return 0 if ok else 1
+
+
+async def run_network(headless=False, slow_mo=500):
+    """
+    Run the network monitoring demo
+    
+    Args:
+        headless (bool): Run browser in headless mode
+        slow_mo (int): Milliseconds to slow each browser action down by
+    
+    Returns:
+        int: Process exit code
+    """
+    print("\n→ Running network monitoring demo...")
+    
+    bot = PriceTrackerBot(headless=headless, slow_mo=slow_mo)
+    await bot.initialize()
+    
+    try:
+        await bot.intercept_network_requests()
+    finally:
+        await bot.close()
+    
+    print("\n✓ Network monitoring completed!")
+    return 0
+
+
+async def interactive_menu():
+    """Original menu-driven entry point, used when no command is given"""
     
     print("""
     ╔══════════════════════════════════════════════════════════╗
@@ -513,9 +736,6 @@ async def main():
     ╚══════════════════════════════════════════════════════════╝
     """)
     
-    # Create screenshots directory
-    os.makedirs('screenshots', exist_ok=True)
-    
     print("\nSelect a demo to run:")
     print("1. Basic Navigation & Screenshots")
     print("2. Form Interaction & Search")
@@ -536,73 +756,208 @@ async def main():
         await demo_data_extraction()
         
     elif choice == "4":
-        print("\n→ Running complete price tracker demo...")
-        
-        # Initialize bot
-        bot = PriceTrackerBot(headless=False)
-        await bot.initialize()
-        
-        try:
-            # Demo 1: Scrape products
-            await bot.scrape_demo_products()
-            
-            await asyncio.sleep(2)
-            
-            # Demo 2: Wikipedia search
-            await bot.search_wikipedia('Python programming')
-            
-            await asyncio.sleep(2)
-            
-            # Save results
-            bot.save_results_to_excel('tracker_results.xlsx')
-            
-        finally:
-            await bot.close()
-        
-        print("\n✓ Complete demo finished!")
+        await run_crawl(['Python programming'])
         
     elif choice == "5":
-        print("\n→ Running login workflow demo...")
-        
-        bot = PriceTrackerBot(headless=False)
-        await bot.initialize()
-        
-        try:
-            # Test login with demo credentials
-            await bot.test_login_workflow('tomsmith', 'SuperSecretPassword!')
-            
-            await asyncio.sleep(3)
-            
-        finally:
-            await bot.close()
-        
-        print("\n✓ Login demo completed!")
+        await run_login('tomsmith', 'SuperSecretPassword!')
         
     elif choice == "6":
-        print("\n→ Running network monitoring demo...")
-        
-        bot = PriceTrackerBot(headless=False)
-        await bot.initialize()
-        
-        try:
-            await bot.intercept_network_requests()
-            await asyncio.sleep(2)
-            
-        finally:
-            await bot.close()
-        
-        print("\n✓ Network monitoring completed!")
+        await run_network()
         
     else:
         print("\n✗ Invalid choice!")
-        return
+        return 1
     
     print("\n" + "="*60)
     print("Thank you for trying Playwright automation!")
     print("Check the 'screenshots' folder for captured images")
     print("="*60)
+    return 0
+
+
+DEMOS = {
+    'basic': demo_basic_navigation,
+    'form': demo_form_interaction,
+    'extract': demo_data_extraction,
+}
+
+
+def load_config(path):
+    """
+    Load option defaults from a JSON config file
+    
+    Keys use the option names with dashes replaced by underscores,
+    e.g. {"headless": true, "search_terms": ["Python", "Playwright"]}.
+    
+    Args:
+        path (str): Path to JSON config file
+    
+    Returns:
+        dict: Option defaults
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError(f"{path}: config must be a JSON object")
+    return config
+
+
+def build_parser():
+    """Build the command-line parser"""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--config', help='JSON file with default option values')
+    common.add_argument('--headless', action=argparse.BooleanOptionalAction, default=False,
+                        help='Run the browser without a window (default: off)')
+    common.add_argument('--slow-mo', type=int, default=500,
+                        help='Milliseconds to slow each browser action by (default: 500)')
+    
+    extraction = argparse.ArgumentParser(add_help=False)
+    extraction.add_argument('--min-hit-rate', type=float, default=0.5,
+                            help='Abort when a field is found in fewer lookups than this '
+                                 '(0 disables, default: 0.5)')
+    extraction.add_argument('--selector-stats', default=DEFAULT_STATS_FILE,
+                            help=f'Selector hit-rate history (default: {DEFAULT_STATS_FILE})')
+    extraction.add_argument('--max-navigations', type=int, default=50,
+                            help='Replace the page after this many navigations (default: 50)')
+    extraction.add_argument('--max-rss-mb', type=int,
+                            help='Replace the browser context when Python, driver and browser '
+                                 'together use more memory than this')
+    
+    parser = argparse.ArgumentParser(
+        description='Playwright Web Automation & Scraping Demo',
+        epilog='Run without a command for the interactive menu.',
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    
+    scrape = subparsers.add_parser('scrape', parents=[common, extraction],
+                                   help='Scrape demo products and save them to Excel')
+    scrape.add_argument('--output', default='tracker_results.xlsx',
+                        help='Excel file to write (default: tracker_results.xlsx)')
+    scrape.add_argument('--limit', type=int, default=5,
+                        help='Products to extract, 0 for all (default: 5)')
+    
+    crawl = subparsers.add_parser('crawl', parents=[common, extraction],
+                                  help='Full price tracker run: products plus Wikipedia lookups')
+    crawl.add_argument('--output', default='tracker_results.xlsx',
+                       help='Excel file to write (default: tracker_results.xlsx)')
+    crawl.add_argument('--limit', type=int, default=5,
+                       help='Products to extract, 0 for all (default: 5)')
+    crawl.add_argument('--search', dest='search_terms', action='append',
+                       help='Wikipedia search term (repeatable, default: "Python programming")')
+    crawl.add_argument('--delay', type=float, default=2.0,
+                       help='Seconds to pause between steps (default: 2.0)')
+    
+    login = subparsers.add_parser('login', parents=[common],
+                                  help='Run the login workflow demo')
+    login.add_argument('--username', default='tomsmith')
+    login.add_argument('--password', default='SuperSecretPassword!')
+    
+    subparsers.add_parser('network', parents=[common],
+                          help='Capture the network requests of a page load')
+    
+    demo = subparsers.add_parser('demo', parents=[common],
+                                 help='Run one of the standalone demos')
+    demo.add_argument('name', choices=sorted(DEMOS))
+    
+    return parser, subparsers
+
+
+# Options declared with action='append'
+REPEATABLE_OPTIONS = ('search_terms',)
+
+
+def parse_args(argv=None):
+    """
+    Parse command-line arguments, using --config values as defaults
+    
+    Args:
+        argv (list): Arguments to parse (defaults to sys.argv[1:])
+    
+    Returns:
+        Namespace: Parsed arguments
+    """
+    pre = argparse.ArgumentParser(add_help=False)
+    pre.add_argument('--config')
+    known, _ = pre.parse_known_args(argv)
+    
+    parser, subparsers = build_parser()
+    config = {}
+    if known.config:
+        try:
+            config = load_config(known.config)
+        except (OSError, ValueError) as e:
+            parser.error(f"could not read config: {e}")
+    
+    # Repeatable options would append flags to the config's list instead of
+    # replacing it, so those values are filled in only when the flag is absent
+    repeatable = {key: config.pop(key) for key in REPEATABLE_OPTIONS if key in config}
+    for subparser in subparsers.choices.values():
+        subparser.set_defaults(**config)
+    
+    args = parser.parse_args(argv)
+    for key, value in repeatable.items():
+        if hasattr(args, key) and getattr(args, key) is None:
+            setattr(args, key, value)
+    return args
+
+
+async def main(argv=None):
+    """
+    Command-line entry point
+    
+    Args:
+        argv (list): Arguments to parse (defaults to sys.argv[1:])
+    
+    Returns:
+        int: Process exit code
+    """
+    args = parse_args(argv)
+    
+    # Create screenshots directory
+    os.makedirs('screenshots', exist_ok=True)
+    
+    if args.command is None:
+        return await interactive_menu()
+    
+    browser_options = {'headless': args.headless, 'slow_mo': args.slow_mo}
+    
+    if args.command == 'scrape':
+        return await run_scrape(
+            args.output,
+            limit=args.limit or None,
+            min_hit_rate=args.min_hit_rate,
+            selector_stats=args.selector_stats,
+            max_navigations=args.max_navigations,
+            max_rss_mb=args.max_rss_mb,
+            **browser_options,
+        )
+    
+    if args.command == 'crawl':
+        return await run_crawl(
+            args.search_terms or ['Python programming'],
+            output=args.output,
+            limit=args.limit or None,
+            delay=args.delay,
+            min_hit_rate=args.min_hit_rate,
+            selector_stats=args.selector_stats,
+            max_navigations=args.max_navigations,
+            max_rss_mb=args.max_rss_mb,
+            **browser_options,
+        )
+    
+    if args.command == 'login':
+        return await run_login(args.username, args.password, **browser_options)
+    
+    if args.command == 'network':
+        return await run_network(**browser_options)
+    
+    if args.command == 'demo':
+        await DEMOS[args.name](**browser_options)
+        return 0
+    
+    return 1
 
 
 if __name__ == "__main__":
     # Run the main async function
-    asyncio.run(main())
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,139 @@
+"""
+Streaming Excel export
+Rows go straight into an xlsxwriter workbook in constant_memory mode, which
+writes each row to disk as soon as the next one starts instead of holding
+every cell in memory. Sheets are split automatically at Excel's row limit,
+and only a short preview is printed.
+"""
+
+from datetime import datetime
+
+# Excel's hard limit per worksheet, header row included
+EXCEL_MAX_ROWS = 1_048_576
+
+PREVIEW_ROWS = 5
+
+DATETIME_FORMAT = 'yyyy-mm-dd hh:mm:ss'
+
+
+def write_rows(filename, header, rows, sheet_name='Results', max_rows=EXCEL_MAX_ROWS):
+    """
+    Stream rows into a new workbook, starting a new sheet when one is full
+
+    Args:
+        filename (str): Excel file to write
+        header (list): Column names, repeated at the top of every sheet
+        rows (iterable): Row tuples; consumed once, never held in memory
+        sheet_name (str): Name of the first sheet; later ones get " 2", " 3", ...
+        max_rows (int): Rows per sheet including the header
+
+    Returns:
+        int: Number of data rows written
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(filename, {
+        'constant_memory': True,
+        # Scraped text is data: no hyperlinks (capped per sheet) and no formulas
+        'strings_to_urls': False,
+        'strings_to_formulas': False,
+    })
+    date_format = workbook.add_format({'num_format': DATETIME_FORMAT})
+
+    def write_datetime(sheet, row, column, value, cell_format=None):
+        return sheet.write_datetime(row, column, value, cell_format or date_format)
+
+    sheet = None
+    sheets = 0
+    sheet_rows = max_rows  # Forces a sheet to be created for the first row
+    written = 0
+
+    for row in rows:
+        if sheet_rows >= max_rows:
+            sheets += 1
+            title = sheet_name if sheets == 1 else f"{sheet_name[:25]} {sheets}"
+            sheet = workbook.add_worksheet(title)
+            sheet.add_write_handler(datetime, write_datetime)
+            sheet.write_row(0, 0, header)
+            sheet_rows = 1
+        sheet.write_row(sheet_rows, 0, row)
+        sheet_rows += 1
+        written += 1
+
+    if sheet is None:
+        workbook.add_worksheet(sheet_name).write_row(0, 0, header)
+
+    workbook.close()
+    return written
+
+
+def _record_header(records):
+    """Union of the export columns of every record type, in first-seen order"""
+    header = {}
+    seen = set()
+    for record in records:
+        record_type = type(record)
+        if record_type not in seen:
+            seen.add(record_type)
+            for _, column in record_type.COLUMNS:
+                header.setdefault(column, None)
+    return list(header)
+
+
+def record_rows(records, header):
+    """Yield one row per result record, timestamps as local datetimes"""
+    layouts = {}
+    for record in records:
+        record_type = type(record)
+        layout = layouts.get(record_type)
+        if layout is None:
+            attrs = {column: attr for attr, column in record_type.COLUMNS}
+            layout = layouts[record_type] = [attrs.get(column) for column in header]
+
+        row = [
+            None if attr is None
+            else datetime.fromtimestamp(int(record.timestamp)) if attr == 'timestamp'
+            else getattr(record, attr)
+            for attr in layout
+        ]
+        yield row
+
+
+def export_records(records, filename, sheet_name='Results'):
+    """
+    Write result records (see result_records) to Excel without a DataFrame
+
+    Args:
+        records (list): ProductResult / ArticleResult records
+        filename (str): Excel file to write
+        sheet_name (str): Name of the first sheet
+
+    Returns:
+        tuple: (header, rows written)
+    """
+    header = _record_header(records)
+    return header, write_rows(filename, header, record_rows(records, header), sheet_name)
+
+
+def print_preview(header, rows, total, limit=PREVIEW_ROWS, width=30):
+    """
+    Print a bounded preview instead of the whole table
+
+    Args:
+        header (list): Column names
+        rows (iterable): Rows to show (only the first ``limit`` are read)
+        total (int): Total number of rows, for the footer
+        limit (int): Maximum rows to print
+        width (int): Maximum characters per cell
+    """
+    def cell(value):
+        text = '' if value is None else str(value)
+        return text if len(text) <= width else text[:width - 1] + '…'
+
+    print(' | '.join(cell(column) for column in header))
+    for shown, row in enumerate(rows):
+        if shown >= limit:
+            break
+        print(' | '.join(cell(value) for value in row))
+    if total > limit:
+        print(f"… {total - limit} more rows")
@@ -0,0 +1,251 @@
+"""
+Structured network capture for Playwright pages
+Streams one HAR entry per finished or failed request straight to disk,
+records timings and transfer sizes, and keeps running per-domain and
+per-resource-type totals, so memory and console output stay bounded no
+matter how many requests a page makes.
+"""
+
+from datetime import datetime, timezone
+import asyncio
+import json
+from urllib.parse import parse_qsl, urlsplit
+
+HAR_VERSION = '1.2'
+
+# Playwright does not report the protocol; its own HAR recorder falls back to this too
+HTTP_VERSION = 'HTTP/1.1'
+
+
+def _span(start, end):
+    """Duration between two Playwright timing marks, -1 if either is missing"""
+    if start is None or end is None or start < 0 or end < 0:
+        return -1
+    return round(end - start, 3)
+
+
+def _har_timings(timing):
+    """
+    Convert Playwright's request.timing into HAR timings
+
+    Playwright reports marks in ms relative to startTime, -1 when unknown.
+    HAR allows -1 only for blocked, dns, connect and ssl; send, wait and
+    receive must be non-negative, so unknown phases there count as 0.
+    """
+    get = timing.get
+    connect_end = get('connectEnd', -1)
+    ssl_start = get('secureConnectionStart', -1)
+    return {
+        'blocked': -1,
+        'dns': _span(get('domainLookupStart'), get('domainLookupEnd')),
+        'connect': _span(get('connectStart'), connect_end),
+        'ssl': _span(ssl_start, connect_end) if ssl_start > 0 else -1,
+        'send': 0,
+        'wait': max(_span(get('requestStart'), get('responseStart')), 0),
+        'receive': max(_span(get('responseStart'), get('responseEnd')), 0),
+    }
+
+
+def _har_time(timings):
+    """Total request time as HAR defines it: the sum of the known timings"""
+    # ssl is already part of connect, so adding it would count it twice
+    return round(sum(value for phase, value in timings.items()
+                     if phase != 'ssl' and value > 0), 3)
+
+
+def _har_headers(headers):
+    """Header dict as a HAR name/value list"""
+    return [{'name': name, 'value': value} for name, value in (headers or {}).items()]
+
+
+class NetworkCapture:
+    """Streaming HAR writer with on-the-fly aggregates"""
+
+    def __init__(self, har_path='network_requests.har', max_prints=20):
+        """
+        Args:
+            har_path (str): HAR file to write
+            max_prints (int): Requests printed to the console before going quiet
+        """
+        self.har_path = har_path
+        self.max_prints = max_prints
+        self.page = None
+        self.handlers = []
+        self.by_domain = {}
+        self.by_type = {}
+        self.totals = {'requests': 0, 'failed': 0, 'bytes': 0}
+        self._file = None
+        self._closed = False
+        self._pending = set()  # _on_finished handlers still awaiting response data
+        self._entries_written = 0
+        self._printed = 0
+
+    def open(self):
+        """Start the HAR document; entries are appended as they arrive"""
+        self._file = open(self.har_path, 'w', encoding='utf-8')
+        header = {'version': HAR_VERSION, 'creator': {'name': 'PriceTrackerBot', 'version': '1.0'}}
+        # Write everything up to the entries array; close() adds the closing brackets
+        self._file.write('{"log": ' + json.dumps(header)[:-1] + ', "entries": [\n')
+
+    async def drain(self, timeout=5.0):
+        """
+        Wait for requests that finished but are still fetching their sizes
+
+        Args:
+            timeout (float): Seconds to wait before giving up on stragglers
+        """
+        if self._pending:
+            await asyncio.wait(set(self._pending), timeout=timeout)
+
+    def close(self):
+        """Finish the HAR document; requests completing after this are ignored"""
+        self._closed = True
+        if self._file:
+            self._file.write('\n]}}\n')
+            self._file.close()
+            self._file = None
+
+    def attach(self, page):
+        """
+        Start listening to a page's network events
+
+        Args:
+            page (Page): Playwright page
+        """
+        if self._file is None:
+            self.open()
+        self.page = page
+        self.handlers = [
+            ('request', self._on_request),
+            ('requestfinished', self._on_finished),
+            ('requestfailed', self._on_failed),
+        ]
+        for event, handler in self.handlers:
+            page.on(event, handler)
+
+    def detach(self):
+        """Remove this capture's listeners from the page"""
+        if self.page:
+            for event, handler in self.handlers:
+                self.page.remove_listener(event, handler)
+        self.page = None
+        self.handlers = []
+
+    def _on_request(self, request):
+        """Print the first few requests so the demo still shows activity"""
+        if self._printed < self.max_prints:
+            self._printed += 1
+            print(f"  📡 Request: {request.method} {request.resource_type} - {request.url[:80]}")
+            if self._printed == self.max_prints:
+                print("  … further requests are written to the HAR file only")
+
+    async def _on_finished(self, request):
+        """Record a request that completed"""
+        task = asyncio.current_task()
+        self._pending.add(task)
+        try:
+            response = await request.response()
+            sizes = await request.sizes()
+        except Exception:
+            # The page may already be gone; keep what the request object knows
+            response, sizes = None, {}
+        finally:
+            self._pending.discard(task)
+        self._record(request, response, sizes, failure=None)
+
+    def _on_failed(self, request):
+        """Record a request that failed"""
+        self._record(request, None, {}, failure=request.failure or 'failed')
+
+    def _record(self, request, response, sizes, failure):
+        """Stream one HAR entry and update the aggregates"""
+        if self._closed:
+            # Keep the file and the aggregates in agreement
+            return
+
+        timing = request.timing or {}
+        timings = _har_timings(timing)
+        total = _har_time(timings)
+        body_size = sizes.get('responseBodySize', -1)
+        headers_size = sizes.get('responseHeadersSize', -1)
+        transferred = max(body_size, 0) + max(headers_size, 0)
+
+        response_headers = response.headers if response else {}
+
+        start = timing.get('startTime')
+        started = datetime.fromtimestamp(start / 1000, timezone.utc) if start else datetime.now(timezone.utc)
+
+        entry = {
+            'startedDateTime': started.isoformat(),
+            'time': total,
+            'request': {
+                'method': request.method,
+                'url': request.url,
+                'httpVersion': HTTP_VERSION,
+                'cookies': [],
+                'headers': _har_headers(request.headers),
+                'queryString': [{'name': name, 'value': value} for name, value
+                                in parse_qsl(urlsplit(request.url).query, keep_blank_values=True)],
+                'headersSize': sizes.get('requestHeadersSize', -1),
+                'bodySize': sizes.get('requestBodySize', -1),
+            },
+            'response': {
+                'status': response.status if response else 0,
+                'statusText': response.status_text if response else '',
+                'httpVersion': HTTP_VERSION,
+                'cookies': [],
+                'headers': _har_headers(response_headers),
+                'content': {
+                    'size': max(body_size, 0),
+                    'mimeType': response_headers.get('content-type', ''),
+                },
+                'redirectURL': response_headers.get('location', ''),
+                'headersSize': headers_size,
+                'bodySize': body_size,
+            },
+            'cache': {},
+            'timings': timings,
+            '_resourceType': request.resource_type,
+        }
+        if failure:
+            entry['_failure'] = failure
+
+        if self._file:
+            self._file.write((',\n' if self._entries_written else '') + json.dumps(entry))
+            self._entries_written += 1
+
+        self.totals['requests'] += 1
+        self.totals['bytes'] += transferred
+        if failure:
+            self.totals['failed'] += 1
+
+        domain = urlsplit(request.url).hostname or '(none)'
+        for table, key in ((self.by_domain, domain), (self.by_type, request.resource_type)):
+            stats = table.setdefault(key, {'requests': 0, 'failed': 0, 'bytes': 0,
+                                           'total_ms': 0.0, 'max_ms': 0.0})
+            stats['requests'] += 1
+            stats['bytes'] += transferred
+            stats['total_ms'] += total
+            stats['max_ms'] = max(stats['max_ms'], total)
+            if failure:
+                stats['failed'] += 1
+
+    def summary(self):
+        """
+        Aggregated statistics for everything captured so far
+
+        Returns:
+            dict: Totals plus per-domain and per-resource-type breakdowns
+        """
+        return {**self.totals, 'by_domain': self.by_domain, 'by_type': self.by_type}
+
+    def print_summary(self, top=5):
+        """Print totals and the heaviest domains and resource types"""
+        print(f"\n  ✓ Captured {self.totals['requests']} network requests "
+              f"({self.totals['failed']} failed, {self.totals['bytes'] / 1024:.0f} KB)")
+        for title, table in (('domain', self.by_domain), ('type', self.by_type)):
+            print(f"  → Slowest by {title} (total ms / requests / KB):")
+            ranked = sorted(table.items(), key=lambda item: item[1]['total_ms'], reverse=True)
+            for key, stats in ranked[:top]:
+                print(f"     {key[:40]:40} {stats['total_ms']:9.0f} {stats['requests']:5d} "
+                      f"{stats['bytes'] / 1024:8.0f}")
@@ -0,0 +1,207 @@
+"""
+Page and context lifecycle management for long-running bots
+Chromium renderers grow with every navigation, and listeners added to a page
+are never released while the page lives. The lifecycle manager counts every
+main-frame navigation (including those started by clicks and key presses),
+watches the memory of the whole process tree (Python, the Playwright driver
+and the browser), and swaps in a fresh page or context before the bot's
+next goto(). Cookies and local storage carry over and page
+observers (e.g. NetworkCapture) are moved to the new page, so the job in
+progress continues where it was.
+"""
+
+import os
+
+MB = 1024 * 1024
+
+
+def _proc_tree_rss(root):
+    """Sum RSS of a process and its descendants from /proc (Linux)"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', encoding='utf-8') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces; fields after it are fixed
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    stack = [root]
+    while stack:
+        pid = stack.pop()
+        try:
+            with open(f'/proc/{pid}/statm', encoding='utf-8') as f:
+                total += int(f.read().split()[1]) * page_size
+        except OSError:
+            continue
+        stack.extend(children.get(pid, ()))
+    return total
+
+
+def process_tree_rss():
+    """
+    Resident memory of this process and all of its children
+
+    Uses psutil when it is installed, /proc on Linux otherwise.
+
+    Returns:
+        int: Bytes, or None if it cannot be measured on this platform
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil:
+        process = psutil.Process()
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    if os.path.isdir('/proc'):
+        return _proc_tree_rss(os.getpid())
+    return None
+
+
+class PageLifecycle:
+    """
+    Recycles a bot's page and context by navigation count and memory ceiling
+
+    Register it with bot.observe() so it sees the navigations of every page.
+    """
+
+    def __init__(self, bot, max_navigations=50, pages_per_context=5, max_rss_mb=None,
+                 rss_cooldown=10):
+        """
+        Args:
+            bot (PriceTrackerBot): Owner of browser/context/page, new_context() and observers
+            max_navigations (int): Navigations before the page is replaced
+            pages_per_context (int): Page replacements before the context is replaced too
+            max_rss_mb (int): Replace the context when the process tree exceeds this (None to disable)
+            rss_cooldown (int): Navigations between two memory-triggered context replacements
+        """
+        self.bot = bot
+        self.max_navigations = max_navigations
+        self.pages_per_context = pages_per_context
+        self.max_rss_mb = max_rss_mb
+        self.rss_cooldown = rss_cooldown
+        self.page = None
+        self.navigations = 0  # On the current page
+        self.total_navigations = 0
+        self.pages = 1  # Pages opened in the current context
+        self.recycled = {'pages': 0, 'contexts': 0}
+        self.peak_rss_mb = 0.0
+        self._last_rss_recycle = None  # total_navigations at the last memory recycle
+        self._warned_baseline = False
+
+    def attach(self, page):
+        """Count the main-frame navigations of a page"""
+        self.page = page
+        page.on('framenavigated', self._on_navigated)
+
+    def detach(self):
+        """Stop counting the current page's navigations"""
+        if self.page:
+            self.page.remove_listener('framenavigated', self._on_navigated)
+        self.page = None
+
+    def _on_navigated(self, frame):
+        if frame.parent_frame is None:
+            self.navigations += 1
+            self.total_navigations += 1
+
+    def rss_mb(self):
+        """Current process tree memory in MB (None if unknown), tracking the peak"""
+        rss = process_tree_rss()
+        if rss is None:
+            return None
+        rss_mb = rss / MB
+        self.peak_rss_mb = max(self.peak_rss_mb, rss_mb)
+        return rss_mb
+
+    async def renderer_heap_mb(self):
+        """JavaScript heap used by the current page's renderer in MB (Chromium only)"""
+        try:
+            used = await self.bot.page.evaluate(
+                '() => performance.memory ? performance.memory.usedJSHeapSize : null')
+        except Exception:
+            return None
+        return used / MB if used else None
+
+    def _rss_recycle_due(self, rss_mb):
+        """Over the ceiling, and not just after a memory recycle that did not help"""
+        if not self.max_rss_mb or rss_mb is None or rss_mb <= self.max_rss_mb:
+            return False
+        return (self._last_rss_recycle is None
+                or self.total_navigations - self._last_rss_recycle >= self.rss_cooldown)
+
+    async def before_navigation(self):
+        """Recycle if a limit has been reached; call before every page.goto()"""
+        rss_mb = self.rss_mb()
+        if self._rss_recycle_due(rss_mb):
+            await self.recycle(context=True,
+                               reason=f"{rss_mb:.0f} MB > {self.max_rss_mb} MB ceiling")
+            self._last_rss_recycle = self.total_navigations
+
+            rss_mb = self.rss_mb()
+            if rss_mb is not None and rss_mb > self.max_rss_mb and not self._warned_baseline:
+                self._warned_baseline = True
+                print(f"  ⚠ Still {rss_mb:.0f} MB with a fresh context - --max-rss-mb "
+                      f"{self.max_rss_mb} is below what Python, the driver and the browser "
+                      f"need; recycling at most every {self.rss_cooldown} navigations")
+
+        elif self.navigations >= self.max_navigations:
+            await self.recycle(context=self.pages >= self.pages_per_context,
+                               reason=f"{self.navigations} navigations")
+
+    async def recycle(self, context=False, reason=''):
+        """
+        Replace the page (and optionally the context) with a fresh one
+
+        Args:
+            context (bool): Also replace the browser context
+            reason (str): Shown in the log line
+        """
+        bot = self.bot
+        heap_mb = await self.renderer_heap_mb()
+        if heap_mb:
+            reason += f", JS heap {heap_mb:.0f} MB"
+
+        for observer in bot.observers:
+            observer.detach()
+
+        if context:
+            # Carry cookies and local storage over so logged-in jobs keep going
+            state = await bot.context.storage_state()
+            await bot.context.close()  # Closes its pages as well
+            bot.context = await bot.new_context(storage_state=state)
+            self.pages = 0
+            self.recycled['contexts'] += 1
+        else:
+            await bot.page.close()
+            self.recycled['pages'] += 1
+
+        bot.page = await bot.context.new_page()
+        self.pages += 1
+        self.navigations = 0
+
+        for observer in bot.observers:
+            observer.attach(bot.page)
+
+        print(f"  ♻ Recycled {'context' if context else 'page'} ({reason})")
+
+    def print_summary(self):
+        """Print recycle counts and peak memory"""
+        peak = f", peak memory {self.peak_rss_mb:.0f} MB" if self.peak_rss_mb else ''
+        print(f"  → {self.total_navigations} navigations: recycled {self.recycled['pages']} "
+              f"pages and {self.recycled['contexts']} contexts{peak}")
@@ -0,0 +1,53 @@
+"""
+Compact result records for PriceTrackerBot
+Each scraped item is a slotted dataclass holding only its values and a raw
+epoch timestamp. Column names and timestamp formatting are applied once, at
+export time, by excel_export.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class ProductResult:
+    """One product scraped from the demo e-commerce site"""
+
+    # Explicit __slots__ (rather than slots=True) keeps Python 3.9 support;
+    # it also rules out field defaults, so callers pass the timestamp
+    __slots__ = ('name', 'price', 'description', 'source', 'timestamp')
+
+    name: str
+    price: str
+    description: str
+    source: str
+    timestamp: float  # Seconds since the epoch, from time.time()
+
+    # (attribute, export column) pairs in export order
+    COLUMNS = (
+        ('name', 'Product Name'),
+        ('price', 'Price'),
+        ('description', 'Description'),
+        ('timestamp', 'Timestamp'),
+        ('source', 'Source'),
+    )
+
+
+@dataclass
+class ArticleResult:
+    """One Wikipedia article found by a search"""
+
+    __slots__ = ('search_term', 'title', 'first_paragraph', 'url', 'timestamp')
+
+    search_term: str
+    title: str
+    first_paragraph: str
+    url: str
+    timestamp: float  # Seconds since the epoch, from time.time()
+
+    COLUMNS = (
+        ('search_term', 'Search Term'),
+        ('title', 'Article Title'),
+        ('first_paragraph', 'First Paragraph'),
+        ('url', 'URL'),
+        ('timestamp', 'Timestamp'),
+    )
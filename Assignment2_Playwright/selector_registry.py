@@ -0,0 +1,224 @@
+"""
+Selector registry with ranked fallbacks and cross-run health tracking
+Every extracted field has a list of CSS selectors tried in order. Hits and
+misses are counted per selector and per run and saved to a JSON file, so
+selectors that stopped working are demoted on the next run. If a field's
+hit rate in the current run falls below a threshold, extraction aborts
+right away instead of quietly filling the results with "N/A".
+"""
+
+import json
+import os
+import time
+
+DEFAULT_STATS_FILE = 'selector_health.json'
+
+# Ranked selectors per field; the first entry is the one the site uses today
+SELECTORS = {
+    'product.card': ['.product-wrapper', '.thumbnail', '[itemtype*="Product"]'],
+    'product.name': ['.title', '.caption h4 a', '[itemprop="name"]'],
+    'product.price': ['.price', '[itemprop="price"]', '.caption h4.pull-right'],
+    'product.description': ['.description', '[itemprop="description"]', '.caption p'],
+    'wikipedia.title': ['#firstHeading', 'h1.firstHeading', 'main h1'],
+    'wikipedia.paragraph': ['.mw-parser-output > p:not(.mw-empty-elt)', '.mw-parser-output > p',
+                            '#mw-content-text p'],
+    'search.result': ['.result', 'article[data-testid="result"]', 'li[data-layout="organic"]'],
+}
+
+# Runs remembered per field in the stats file
+RUN_HISTORY = 20
+
+
+class SelectorHealthError(Exception):
+    """Raised when a field's hit rate shows the site's markup has changed"""
+
+    def __init__(self, field, hits, lookups):
+        self.field = field
+        self.hits = hits
+        self.lookups = lookups
+        super().__init__(f"selector health check failed for '{field}': "
+                         f"{hits}/{lookups} lookups matched")
+
+
+class SelectorRegistry:
+    """Looks up page elements through ranked selectors and tracks how well they work"""
+
+    def __init__(self, stats_file=DEFAULT_STATS_FILE, min_hit_rate=0.5, min_samples=5,
+                 selectors=None):
+        """
+        Args:
+            stats_file (str): JSON file keeping hit counts across runs (None to disable)
+            min_hit_rate (float): Abort when a field's hit rate drops below this (0 disables)
+            min_samples (int): Lookups of a field before the hit rate is judged
+            selectors (dict): Field -> ranked selectors (defaults to SELECTORS)
+        """
+        self.stats_file = stats_file
+        self.min_hit_rate = min_hit_rate
+        self.min_samples = min_samples
+        self.selectors = selectors or SELECTORS
+        self.stats = self._load()
+        self.run = {}  # field -> [hits, lookups] in this run
+        self._warned = set()
+
+    def _load(self):
+        """Read stats from earlier runs and warn about fields that were failing"""
+        if not self.stats_file or not os.path.exists(self.stats_file):
+            return {}
+        try:
+            with open(self.stats_file, encoding='utf-8') as f:
+                stats = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠ Ignoring unreadable selector stats {self.stats_file}: {e}")
+            return {}
+
+        for field, field_stats in stats.items():
+            runs = field_stats.get('runs') or []
+            if runs and runs[-1]['lookups'] and runs[-1]['hits'] / runs[-1]['lookups'] < self.min_hit_rate:
+                print(f"  ⚠ '{field}' matched {runs[-1]['hits']}/{runs[-1]['lookups']} "
+                      "lookups last run - the site may have changed")
+        return stats
+
+    def _selector_stats(self, field, selector):
+        field_stats = self.stats.setdefault(field, {'selectors': {}, 'runs': []})
+        return field_stats['selectors'].setdefault(selector, {'hits': 0, 'misses': 0})
+
+    def ranked(self, field):
+        """
+        Selectors for a field in the order they should be tried
+
+        Selectors whose historical hit rate is below the threshold move to
+        the back, so a broken primary selector stops costing a lookup.
+        """
+        selectors = self.selectors[field]
+
+        def failing(selector):
+            counts = self.stats.get(field, {}).get('selectors', {}).get(selector)
+            if not counts:
+                return False
+            tried = counts['hits'] + counts['misses']
+            return tried >= self.min_samples and counts['hits'] / tried < self.min_hit_rate
+
+        return sorted(selectors, key=failing)
+
+    def _record(self, field, selector_results):
+        """Count one lookup and abort if the field is clearly broken"""
+        hit = False
+        primary = self.selectors[field][0]
+        tried = [selector for selector, _ in selector_results]
+        for selector, matched in selector_results:
+            self._selector_stats(field, selector)['hits' if matched else 'misses'] += 1
+            hit = hit or matched
+            if matched and selector != primary and field not in self._warned:
+                self._warned.add(field)
+                if primary in tried:
+                    problem = "matched nothing"
+                else:
+                    problem = "was skipped after failing in earlier runs"
+                print(f"  ⚠ '{field}': primary selector {primary!r} {problem}, "
+                      f"using fallback {selector!r}")
+
+        counts = self.run.setdefault(field, [0, 0])
+        counts[0] += hit
+        counts[1] += 1
+
+        hits, lookups = counts
+        if self.min_hit_rate and lookups >= self.min_samples and hits / lookups < self.min_hit_rate:
+            raise SelectorHealthError(field, hits, lookups)
+
+    async def query(self, root, field):
+        """
+        Find the first element matching a field's selectors
+
+        Args:
+            root (Page | ElementHandle): Where to search
+            field (str): Registry field name
+
+        Returns:
+            ElementHandle: Matching element, or None
+        """
+        tried = []
+        for selector in self.ranked(field):
+            element = await root.query_selector(selector)
+            tried.append((selector, element is not None))
+            if element:
+                break
+        self._record(field, tried)
+        return element
+
+    async def query_all(self, root, field):
+        """
+        Find all elements for the first of a field's selectors that matches any
+
+        Returns:
+            list: Matching elements (empty if no selector matched)
+        """
+        tried = []
+        elements = []
+        for selector in self.ranked(field):
+            elements = await root.query_selector_all(selector)
+            tried.append((selector, bool(elements)))
+            if elements:
+                break
+        self._record(field, tried)
+        return elements
+
+    async def text(self, root, field, default='N/A'):
+        """
+        Inner text of a field's element
+
+        Returns:
+            str: Element text, or ``default`` if nothing matched
+        """
+        element = await self.query(root, field)
+        return await element.inner_text() if element else default
+
+    async def wait_for(self, page, field, timeout=10000):
+        """
+        Wait until any of a field's selectors is present
+
+        A timeout means none of the selectors exist on the page at all. It is
+        recorded as a miss for each of them and, unless the health check is
+        disabled, aborts right away: a page without its list container will
+        not get better with more samples.
+
+        Args:
+            page (Page): Playwright page
+            field (str): Registry field name
+            timeout (int): Milliseconds to wait
+
+        Raises:
+            SelectorHealthError: If no selector appeared within the timeout
+        """
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+        selectors = self.ranked(field)
+        try:
+            await page.wait_for_selector(', '.join(selectors), timeout=timeout)
+        except PlaywrightTimeoutError:
+            self._record(field, [(selector, False) for selector in selectors])
+            if not self.min_hit_rate:
+                raise
+            hits, lookups = self.run[field]
+            raise SelectorHealthError(field, hits, lookups) from None
+
+    def save(self):
+        """Append this run's hit rates to the stats file"""
+        for field, (hits, lookups) in self.run.items():
+            field_stats = self.stats.setdefault(field, {'selectors': {}, 'runs': []})
+            field_stats['runs'] = (field_stats['runs'] + [
+                {'time': round(time.time()), 'hits': hits, 'lookups': lookups}
+            ])[-RUN_HISTORY:]
+
+        if self.stats_file:
+            with open(self.stats_file, 'w', encoding='utf-8') as f:
+                json.dump(self.stats, f, indent=1)
+        self.run = {}
+
+    def print_summary(self):
+        """Print this run's hit rate per field"""
+        if not self.run:
+            return
+        print("\n🩺 Selector health:")
+        for field, (hits, lookups) in sorted(self.run.items()):
+            marker = '✓' if hits == lookups else '⚠'
+            print(f"  {marker} {field}: {hits}/{lookups} matched")